@@ -61,7 +61,8 @@ Write 150-200 words for Moltbook. Be authoritative, insightful, opinionated.
 Include a punchy title (under 70 chars) on the first line, then content.
 Format: TITLE\n\nCONTENT"""
 
-    trending_analysis = agent._call_llm(trending_prompt, max_tokens=1024, temperature=0.8, use_full_context=False)
+    trending_analysis = agent._call_llm(trending_prompt, max_tokens=1024, temperature=0.8, use_full_context=False,
+                                       site="catchup_trending")
 
     if trending_analysis:
         lines = trending_analysis.strip().split('\n', 1)
@@ -92,7 +93,8 @@ Topics could be:
 Write 80-120 words. Be spicy but smart. Make molts want to debate you.
 First line is the title (provocative, under 70 chars), then the take."""
 
-    hottake = agent._call_llm(hottake_prompt, max_tokens=512, temperature=0.9, use_full_context=False)
+    hottake = agent._call_llm(hottake_prompt, max_tokens=512, temperature=0.9, use_full_context=False,
+                              site="catchup_hottake")
 
     if hottake:
         lines = hottake.strip().split('\n', 1)
@@ -123,7 +125,8 @@ Write 300-400 words. Make it engaging, informative, and promotional.
 Format for Moltbook (long-form). Be entertaining AND authoritative.
 Title on first line: "📰 MOLT MEDIA CATCH-UP BRIEF - [date]" """
 
-    brief = agent._call_llm(brief_prompt, max_tokens=1500, temperature=0.7, use_full_context=False)
+    brief = agent._call_llm(brief_prompt, max_tokens=1500, temperature=0.7, use_full_context=False,
+                            site="catchup_brief")
 
     if brief:
         lines = brief.strip().split('\n', 1)
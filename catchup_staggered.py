@@ -7,26 +7,16 @@ Handles Moltbook's 30-minute rate limit by staggering posts
 import sys
 import time
 from molt_media_agent import MoltMediaAgent
-from datetime import datetime, timezone
 
 def create_moltx_only_post(agent, content, title, source):
-    """Post to MoltX only (for rate-limited scenarios)"""
-    moltx_content = content[:500] if len(content) > 500 else content
+    """Post to MoltX now and queue the Moltbook copy (for rate-limited scenarios)"""
+    # Both halves go through the outbound queue; the running agent drains the
+    # Moltbook job as the 30-minute limit allows (and retries MoltX if it failed)
+    jobs = agent._enqueue_post(source, content, title=title)
+    moltx_result = agent._run_outbound_job(jobs["moltx"])
 
-    moltx_data = {
-        "content": moltx_content,
-        "visibility": "public"
-    }
-
-    moltx_result = agent._call_moltx_api("/v1/posts", method="POST", data=moltx_data)
-
-    if moltx_result:
-        agent._log_activity("POST_CREATED", f"[{source}] MoltX only (queued for Moltbook) | {content[:80]}...")
-        agent.state["last_post"] = datetime.now(timezone.utc).isoformat()
-        agent.state["total_posts"] += 1
-        agent._save_state()
-        return True
-    return False
+    agent._record_post(source, content, moltx_result, None)
+    return bool(moltx_result)
 
 def main():
     print("=" * 60)
@@ -91,6 +81,7 @@ def main():
         time.sleep(1)
 
     print(f"\n✅ Posted {success_count}/{len(posts)} to MoltX")
+    print(f"📤 Outbound queue: {agent.outbound.counts()}")
     print(f"📊 Total posts: {agent.state['total_posts']}")
 
     print("\n" + "=" * 60)
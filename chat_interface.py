@@ -6,12 +6,16 @@ Uses Claude Haiku 4.5 via Anthropic API
 
 import os
 import json
+import signal
+import functools
 from pathlib import Path
 from flask import Flask, render_template_string, request, jsonify
 import anthropic
 from dotenv import load_dotenv
 import datetime
 
+from llm_cache import LLMResponseCache
+
 # Load environment variables
 load_dotenv()
 
@@ -24,9 +28,15 @@ if not os.getenv("ANTHROPIC_API_KEY"):
 anthropic_client = anthropic.Anthropic()  # Uses ANTHROPIC_API_KEY env var
 print("✅ Anthropic client initialized (Claude Haiku 4.5)")
 
+# Repeated questions (e.g. the same strategy question twice) are answered from the shared response cache
+response_cache = LLMResponseCache(Path(__file__).parent / "memory" / "molt_media.db",
+                                  max_entries=int(os.getenv("LLM_CACHE_SIZE", "256")),
+                                  ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "3600")))
+
 # Load personality (minimal for chat)
+@functools.lru_cache(maxsize=1)
 def load_personality():
-    """Load agent personality from markdown files - MINIMAL VERSION"""
+    """Load agent personality - MINIMAL VERSION (static, built once)"""
     system_prompt = """You are Hank, operating as Molt Media - the autonomous AI news agency.
 
 ## IMPORTANT: You're in PRIVATE CHAT MODE
@@ -78,11 +88,37 @@ See GOALS.md and COMMUNITY_GOALS.md for full details.
 - Running autonomously on Oracle Cloud
 - Newsletter Subscribers: 0 → Target 100 (Month 1)
 - Leaderboard: #38 → Climbing to Top 20
-- This chat: Private backchannel with your operator
-- Current time: """ + datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
+- This chat: Private backchannel with your operator"""
 
     return system_prompt
 
+def build_system_prompt(extra: str = ""):
+    """Personality followed by the per-request parts (time, tip handling)"""
+    return (load_personality() + "\n- Current time: "
+            + datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M UTC') + extra)
+
+def is_agent_process(pid):
+    """True if the PID belongs to a running molt_media_agent (guards against stale/reused PIDs)"""
+    try:
+        cmdline = Path(f'/proc/{pid}/cmdline').read_bytes()
+    except OSError:
+        return False
+    return b'molt_media_agent' in cmdline
+
+def wake_agent():
+    """Signal the running agent (via its PID file) to process urgent tips now"""
+    pid_file = Path(__file__).parent / 'agent.pid'
+    if not pid_file.exists() or not hasattr(signal, 'SIGUSR1'):
+        return
+    try:
+        pid = int(pid_file.read_text().strip())
+        if not is_agent_process(pid):
+            print(f"PID {pid} in agent.pid is not a running agent; the tip will be picked up on its next poll")
+            return
+        os.kill(pid, signal.SIGUSR1)
+    except (ValueError, OSError) as e:
+        print(f"Could not wake agent (it will pick the tip up on its next poll): {e}")
+
 # HTML template
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -401,12 +437,10 @@ def chat():
         # Check if this is a news tip
         is_news_tip = any(keyword in user_message.lower() for keyword in ['news tip', 'breaking:', 'cover this', 'post this'])
 
-        # Get personality
-        system_prompt = load_personality()
-
         # Add context about tip handling
+        tip_context = ""
         if is_news_tip:
-            system_prompt += """
+            tip_context = """
 
 IMPORTANT: The user just gave you a NEWS TIP. Respond like this:
 
@@ -417,15 +451,24 @@ I'm saving this as an urgent tip that will be processed in my next cycle."
 DO NOT draft the full post in chat. DO NOT write breaking news content here. Just acknowledge and confirm.
 """
 
-        # Call Claude Haiku 4.5
+        # Call Claude Haiku 4.5 (tips always get a fresh call; the key leaves out the per-minute time stamp so repeats hit)
         try:
-            response = anthropic_client.messages.create(
-                model="claude-haiku-4-5-20251001",
-                max_tokens=1024,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}]
+            system_prompt = build_system_prompt(tip_context)
+            cache_key = None if is_news_tip else LLMResponseCache.make_key(
+                "chat", "claude-haiku-4-5-20251001", load_personality(), user_message, 1024
             )
-            response_text = response.content[0].text
+            response_text = response_cache.get(cache_key) if cache_key else None
+
+            if response_text is None:
+                response = anthropic_client.messages.create(
+                    model="claude-haiku-4-5-20251001",
+                    max_tokens=1024,
+                    system=system_prompt,
+                    messages=[{"role": "user", "content": user_message}]
+                )
+                response_text = response.content[0].text
+                if cache_key:
+                    response_cache.put(cache_key, response_text)
 
             # If this was a news tip, save it to urgent_tips.json
             if is_news_tip:
@@ -444,6 +487,8 @@ DO NOT draft the full post in chat. DO NOT write breaking news content here. Jus
 
                     with open(tips_file, 'w') as f:
                         json.dump(tips, f, indent=2)
+
+                    wake_agent()
                 except Exception as e:
                     print(f"Failed to save tip: {e}")
 
@@ -455,6 +500,14 @@ DO NOT draft the full post in chat. DO NOT write breaking news content here. Jus
         print(f"Error in chat endpoint: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/stats')
+def stats():
+    """Response-cache counters for chat calls"""
+    return jsonify({
+        'response_cache_hits': response_cache.hits,
+        'response_cache_misses': response_cache.misses
+    })
+
 if __name__ == '__main__':
     print("\n📡 Molt Media Chat Interface")
     print("=" * 50)
@@ -0,0 +1,90 @@
+"""
+LLM response cache shared by the Molt Media agent and the chat interface
+
+Kept free of the agent's import-time setup (dotenv, logging) so the chat UI
+can use it without loading the whole daemon.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+class LLMResponseCache:
+    """Content-addressed LLM response cache: LRU + TTL in memory, with an SQLite tier"""
+
+    def __init__(self, db_path: Path, max_entries: int = 256, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # Same settings as the agent's other stores, which share this database file
+        self._conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Stable hash of everything that determines the completion"""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response if present and not expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                entry = (row[0], row[1]) if row else None
+
+            if entry is None or now - entry[1] > self.ttl_seconds:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            self._evict()
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, response: str):
+        """Store a response in both tiers"""
+        entry = (response, time.time())
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            self._evict()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)", (key, entry[0], entry[1])
+            )
+
+    def _evict(self):
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def prune(self) -> int:
+        """Drop expired entries from the disk tier"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
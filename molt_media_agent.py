@@ -7,20 +7,42 @@ Main daemon for 24/7 autonomous operation
 import os
 import sys
 import json
+import math
+import random
 import time
-import subprocess
 import argparse
+import asyncio
+import gzip
+import hashlib
+import heapq
+import re
+import signal
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Dict, Optional, List
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional, List
+from urllib.parse import quote, urlsplit
 import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import parsedate_to_datetime
 
 import anthropic
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 from dotenv import load_dotenv
 
+from llm_cache import LLMResponseCache
+
 # Load environment variables
 load_dotenv()
 
@@ -34,6 +56,1653 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scheduler tuning: fallback poll for urgent tips (normally pushed via SIGUSR1)
+# and the minimum gap before a job that is still due may run again
+TIPS_POLL_SECONDS = int(os.getenv("TIPS_POLL_SECONDS", "300"))
+JOB_RERUN_FLOOR_SECONDS = int(os.getenv("JOB_RERUN_FLOOR_SECONDS", "180"))
+
+# Activity log rotation: roll activity-log.md into a compressed segment once it
+# passes either limit, and keep structured rows only for the retention window
+ACTIVITY_LOG_MAX_BYTES = int(os.getenv("ACTIVITY_LOG_MAX_BYTES", str(2 * 1024 * 1024)))
+ACTIVITY_LOG_MAX_AGE_HOURS = float(os.getenv("ACTIVITY_LOG_MAX_AGE_HOURS", "24"))
+ACTIVITY_RETENTION_DAYS = float(os.getenv("ACTIVITY_RETENTION_DAYS", "30"))
+
+# Response cache TTLs (seconds) for read endpoints; stale entries are revalidated with ETag/Last-Modified
+FEED_CACHE_TTL = float(os.getenv("FEED_CACHE_TTL", "60"))
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "600"))
+
+# Prompt budget (approximate tokens) for the compacted feed in the wire scan
+FEED_TOKEN_BUDGET = int(os.getenv("FEED_TOKEN_BUDGET", "1500"))
+
+# How many locally pre-ranked posts the wire scan shows the model
+FEED_TOP_K = int(os.getenv("FEED_TOP_K", "25"))
+
+# LLM response cache: in-memory LRU size and entry lifetime (seconds), shared by memory and disk tiers
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "256"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+
+# Wall-clock cap for streaming a long-form edition; past it the edition is cut at a paragraph break
+EDITION_MAX_SECONDS = float(os.getenv("EDITION_MAX_SECONDS", "180"))
+
+# Daily LLM token budget (0 = unlimited); nearing it trims replies and edition length
+DAILY_TOKEN_BUDGET = int(os.getenv("DAILY_TOKEN_BUDGET", "0"))
+LLM_USAGE_HISTORY_DAYS = 14
+
+# Documented platform limits as (requests, window seconds) per (platform, action)
+MOLTX_CLAIMED = os.getenv("MOLTX_CLAIMED", "false").lower() in ("1", "true", "yes")
+PLATFORM_RATE_LIMITS = {
+    ("moltx", "post"): (50, 3600) if MOLTX_CLAIMED else (5, 12 * 3600),
+    ("moltx", "reply"): (200, 3600),
+    ("moltx", "like"): (100, 60),
+    ("moltx", "notification_read"): (300, 60),
+    ("moltx", "other"): (300, 60),
+    ("moltbook", "post"): (1, 30 * 60),
+}
+
+# Outbound post queue: attempts per platform job before giving up, and the first retry delay (doubles each time)
+OUTBOUND_MAX_ATTEMPTS = int(os.getenv("OUTBOUND_MAX_ATTEMPTS", "8"))
+OUTBOUND_RETRY_BASE_SECONDS = float(os.getenv("OUTBOUND_RETRY_BASE_SECONDS", "60"))
+# An in_flight job is only taken back from another process once that process is gone or its
+# claim is older than this (far longer than one send with all its retries can take)
+OUTBOUND_LEASE_SECONDS = float(os.getenv("OUTBOUND_LEASE_SECONDS", "900"))
+# A queued post still unsent after this long is dropped rather than published stale
+OUTBOUND_JOB_TTL_SECONDS = float(os.getenv("OUTBOUND_JOB_TTL_SECONDS", str(6 * 3600)))
+
+# How long _create_post waits on each platform's write before recording the outcome without it
+POST_TIMEOUTS = {
+    "moltx": float(os.getenv("MOLTX_POST_TIMEOUT", "15")),
+    "moltbook": float(os.getenv("MOLTBOOK_POST_TIMEOUT", "30")),
+}
+
+# Leaderboard snapshots: how often the full ranking is recorded, and how long history is kept
+LEADERBOARD_SNAPSHOT_MINUTES = float(os.getenv("LEADERBOARD_SNAPSHOT_MINUTES", "60"))
+LEADERBOARD_HISTORY_DAYS = float(os.getenv("LEADERBOARD_HISTORY_DAYS", "30"))
+
+# Leaderboard pagination: entries per page, and how many pages past the top one a search may fetch
+LEADERBOARD_PAGE_SIZE = 100
+LEADERBOARD_MAX_PAGES = int(os.getenv("LEADERBOARD_MAX_PAGES", "5"))
+
+# Notification paging: page size and the most pages one engagement loop pulls during a burst
+NOTIF_PAGE_SIZE = int(os.getenv("NOTIF_PAGE_SIZE", "50"))
+NOTIF_MAX_PAGES = int(os.getenv("NOTIF_MAX_PAGES", "4"))
+# Claims older than this whose reply was never attempted (the process died first) are requeued at startup
+NOTIF_CLAIM_LEASE_SECONDS = float(os.getenv("NOTIF_CLAIM_LEASE_SECONDS", "600"))
+
+# Notification priority: base score per type, a bonus of up to NOTIF_TOP_AGENT_BONUS for actors currently in
+# the leaderboard top 100, minus an hourly age penalty and NOTIF_RECENT_REPLY_PENALTY per reply we sent the
+# same actor in the last hour; each actor gets at most NOTIF_MAX_PER_ACTOR replies per cycle
+NOTIF_TYPE_SCORES = {
+    "reply": float(os.getenv("NOTIF_SCORE_REPLY", "100")),
+    "mention": float(os.getenv("NOTIF_SCORE_MENTION", "40")),
+    "quote": float(os.getenv("NOTIF_SCORE_QUOTE", "30")),
+}
+NOTIF_TOP_AGENT_BONUS = float(os.getenv("NOTIF_TOP_AGENT_BONUS", "50"))
+NOTIF_AGE_PENALTY_PER_HOUR = float(os.getenv("NOTIF_AGE_PENALTY_PER_HOUR", "5"))
+NOTIF_RECENT_REPLY_PENALTY = float(os.getenv("NOTIF_RECENT_REPLY_PENALTY", "20"))
+NOTIF_MAX_PER_ACTOR = int(os.getenv("NOTIF_MAX_PER_ACTOR", "1"))
+
+# Topics that always make a post more interesting to Molt Media
+BEAT_KEYWORDS = ["agent", "launch", "model", "claude", "gpt", "leaderboard", "molt", "breaking", "release", "open source"]
+
+
+# Minimal context - ENGAGEMENT FOCUSED (default system prompt for _call_llm)
+HANK_SYSTEM_PROMPT = """You're Hank from Molt Media. You're the local paper guy who ACTUALLY TALKS TO PEOPLE.
+
+CORE MISSION: Build a community around your feed. Make people want to be part of the conversation.
+
+HOW TO TALK:
+- Replies: ONE SENTENCE. Period. Max 15 words. Be punchy.
+- Posts: End with a question. Get people talking.
+- Tone: Like a friend, not a news anchor. "yo" not "greetings"
+
+NEVER DO:
+- Write more than 1 sentence in a reply
+- Sound like ChatGPT (no "great question!" or "that's a crucial insight")
+- Use words like: profound, dichotomy, implications, crucial, indeed
+- Write essays when a one-liner works
+
+ALWAYS DO:
+- Reply to people who engage with you
+- Ask questions to spark discussion
+- Tag specific molts, call them out, make it personal
+- Have opinions, take sides, be interesting
+
+You grow by being someone people want to talk to, not by broadcasting."""
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a host's circuit breaker is open"""
+
+
+class RetryPolicy:
+    """Jittered exponential backoff and which failures are worth retrying"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+    def __init__(self, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 max_total_delay: float = 30.0):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+
+    def should_retry(self, method: str, status: Optional[int] = None, error: Optional[Exception] = None) -> bool:
+        """Retry idempotent calls on any transient failure, writes only when they can't have been applied"""
+        if isinstance(error, CircuitOpenError):
+            return False
+        if error is not None:
+            return method in self.IDEMPOTENT_METHODS or self.never_sent(error)
+        if status in (429, 503):
+            return True
+        return status in self.RETRY_STATUSES and method in self.IDEMPOTENT_METHODS
+
+    @staticmethod
+    def never_sent(error: Exception) -> bool:
+        """
+        True if the request failed before a connection was established
+
+        A dropped connection or read timeout may come after the server acted
+        on the body, so only connect timeouts and refused/unresolvable hosts
+        count as never sent.
+        """
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        if not isinstance(error, requests.ConnectionError) or not error.args:
+            return False
+        # requests wraps urllib3's MaxRetryError, whose reason is the underlying failure
+        reason = getattr(error.args[0], "reason", error.args[0])
+        return isinstance(reason, NewConnectionError)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number attempt (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delta-seconds or HTTP date)"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after consecutive failures, lets one probe through after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may go out now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns True if this one opened the breaker"""
+        with self._lock:
+            self._failures += 1
+            was_open = self._opened_at is not None and not self._probing
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+                return not was_open
+            return False
+
+
+class HttpTransport:
+    """Pooled keep-alive HTTP client shared by the MoltX and Moltbook clients"""
+
+    def __init__(self, connect_timeout: float = 5.0, read_timeout: float = 30.0, pool_size: int = 10,
+                 retry_policy: Optional[RetryPolicy] = None, breaker_threshold: int = 5,
+                 breaker_reset_seconds: float = 60.0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self._sessions: Dict[str, requests.Session] = {}
+        self._latencies: Dict[str, deque] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session_for(self, host: str) -> requests.Session:
+        """One session (and connection pool) per host, created on first use"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._latencies[host] = deque(maxlen=200)
+                self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset_seconds)
+            return session
+
+    def request(self, method: str, url: str, headers: Optional[Dict] = None,
+                data: Optional[Dict] = None, timeout: Optional[tuple] = None) -> requests.Response:
+        """Send one request over the pooled session for the URL's host (raises on transport errors)"""
+        host = urlsplit(url).netloc
+        session = self._session_for(host)
+        breaker = self._breakers[host]
+
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {host}")
+
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, headers=headers, json=data, timeout=timeout or self.timeout)
+        except Exception:
+            self._record_outcome(host, ok=False)
+            raise
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self._latencies[host].append(elapsed_ms)
+            logger.debug(f"HTTP {method} {url} took {elapsed_ms:.0f}ms")
+
+        # 429 means the host is up and pacing us - only server errors count against the breaker
+        self._record_outcome(host, ok=response.status_code < 500)
+        return response
+
+    def _record_outcome(self, host: str, ok: bool):
+        breaker = self._breakers[host]
+        if ok:
+            breaker.record_success()
+        elif breaker.record_failure():
+            logger.warning(f"⛔ Circuit open for {host} - failing fast for {breaker.reset_seconds:.0f}s")
+
+    def request_with_retry(self, method: str, url: str, headers: Optional[Dict] = None,
+                           data: Optional[Dict] = None, timeout: Optional[tuple] = None) -> requests.Response:
+        """
+        Send a request, retrying transient failures with jittered backoff
+
+        Retry-After is honoured when it fits within the policy's max delay;
+        a longer wait returns the response at once so the caller can defer.
+        The waits of one call never add up to more than max_total_delay, and
+        inside deferred_retries() nothing is retried in place at all.
+        """
+        policy = self.retry_policy
+        host = urlsplit(url).netloc
+        attempts = 1 if getattr(self._local, "defer_retries", False) else policy.attempts
+        waited = 0.0
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.request(method, url, headers=headers, data=data, timeout=timeout)
+            except requests.RequestException as e:
+                if last_attempt or not policy.should_retry(method, error=e):
+                    raise
+                delay = policy.backoff(attempt)
+                if waited + delay > policy.max_total_delay:
+                    logger.warning(f"⏳ {host} {method} failed ({e.__class__.__name__}) - retry budget spent")
+                    raise
+                logger.warning(f"🔁 {host} {method} failed ({e.__class__.__name__}) - retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+                time.sleep(delay)
+                waited += delay
+                continue
+
+            if last_attempt or not policy.should_retry(method, status=response.status_code):
+                return response
+
+            retry_after = policy.retry_after(response)
+            delay = retry_after if retry_after is not None else policy.backoff(attempt)
+            if delay > policy.max_delay or waited + delay > policy.max_total_delay:
+                logger.warning(f"⏳ {host} asked us to wait {delay:.0f}s (HTTP {response.status_code}) - not retrying now")
+                return response
+            logger.warning(f"🔁 {host} {method} HTTP {response.status_code} - retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+            time.sleep(delay)
+            waited += delay
+
+        return response
+
+    @contextmanager
+    def deferred_retries(self):
+        """Send this thread's requests once, leaving transient failures for the caller to reschedule"""
+        previous = getattr(self._local, "defer_retries", False)
+        self._local.defer_retries = True
+        try:
+            yield
+        finally:
+            self._local.defer_retries = previous
+
+    def circuit_states(self) -> Dict[str, str]:
+        """Breaker state per host"""
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
+
+    def latency_stats(self) -> Dict[str, Dict]:
+        """Per-host latency summary over the most recent requests"""
+        stats = {}
+        with self._lock:
+            for host, samples in self._latencies.items():
+                if not samples:
+                    continue
+                ordered = sorted(samples)
+                stats[host] = {
+                    "count": len(ordered),
+                    "avg_ms": round(sum(ordered) / len(ordered), 1),
+                    "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 1),
+                    "last_ms": round(samples[-1], 1)
+                }
+        return stats
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls against a platform limit"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available right now, never blocks"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available (or the timeout expires)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.refill_per_second if self.refill_per_second > 0 else 1.0
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def level(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def set_level(self, tokens: float):
+        """Overwrite the available tokens (e.g. when restoring a saved level)"""
+        with self._lock:
+            self._refill()
+            self._tokens = max(0.0, min(self.capacity, tokens))
+
+    def lower_level(self, tokens: float):
+        """Cap the available tokens (e.g. at a server-reported remaining count), never raising them"""
+        with self._lock:
+            self._refill()
+            self._tokens = max(0.0, min(self._tokens, tokens))
+
+
+class RateLimitExceeded(Exception):
+    """Raised before a request that the client-side rate limiter says would be rejected"""
+
+
+class RateLimiter:
+    """
+    Token buckets per (platform, action), seeded from documented limits
+
+    X-RateLimit-Remaining/Reset headers and 429s correct the local estimate,
+    and a platform that says "wait" blocks its action until then.
+    """
+
+    def __init__(self, limits: Dict[tuple, tuple]):
+        # limits: (platform, action) -> (requests, window_seconds)
+        self._buckets: Dict[tuple, TokenBucket] = {
+            key: TokenBucket(capacity=count, refill_per_second=count / window)
+            for key, (count, window) in limits.items()
+        }
+        self._blocked_until: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, platform: str, action: str) -> Optional[tuple]:
+        key = (platform.lower(), action)
+        if key in self._buckets:
+            return key
+        fallback = (platform.lower(), "other")
+        return fallback if fallback in self._buckets else None
+
+    def blocked_for(self, platform: str, action: str) -> float:
+        """Seconds until the platform will accept this action again (0 if not blocked)"""
+        key = self._key(platform, action)
+        with self._lock:
+            until = self._blocked_until.get(key, 0.0)
+        return max(0.0, until - time.time())
+
+    def available(self, platform: str, action: str) -> float:
+        """Calls of this action that can go out right now"""
+        key = self._key(platform, action)
+        if key is None:
+            return float("inf")
+        if self.blocked_for(platform, action) > 0:
+            return 0.0
+        return self._buckets[key].level()
+
+    def try_acquire(self, platform: str, action: str) -> bool:
+        """Take one call's worth of quota if available, never blocks"""
+        key = self._key(platform, action)
+        if key is None:
+            return True
+        if self.blocked_for(platform, action) > 0:
+            return False
+        return self._buckets[key].try_acquire()
+
+    def observe(self, platform: str, action: str, response: requests.Response):
+        """
+        Sync a bucket with the platform's rate-limit headers
+
+        Headers describe whichever server-side limit answered, which may be a
+        broader one (e.g. 300/min for all calls) than this bucket. They are
+        ignored when X-RateLimit-Limit names a different capacity, and may
+        only ever lower the local level, never refill it.
+        """
+        key = self._key(platform, action)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        limit = response.headers.get("X-RateLimit-Limit")
+        try:
+            if limit is not None and float(limit) != bucket.capacity:
+                remaining = reset = None
+        except ValueError:
+            remaining = reset = None
+        if remaining is not None:
+            try:
+                bucket.lower_level(float(remaining))
+            except ValueError:
+                pass
+
+        block_until = None
+        if response.status_code == 429:
+            retry_after = RetryPolicy.retry_after(response)
+            block_until = time.time() + retry_after if retry_after is not None else None
+            bucket.set_level(0)
+        if (response.status_code == 429 or remaining == "0") and reset:
+            try:
+                block_until = max(block_until or 0.0, float(reset))
+            except ValueError:
+                pass
+        if block_until:
+            with self._lock:
+                self._blocked_until[key] = block_until
+            logger.warning(f"🚦 {platform} {action} limit reached - holding off {block_until - time.time():.0f}s")
+
+    def wait_time(self, platform: str, action: str) -> float:
+        """Seconds until one call of this action can go out"""
+        key = self._key(platform, action)
+        if key is None:
+            return 0.0
+        bucket = self._buckets[key]
+        level = bucket.level()
+        refill = 0.0 if level >= 1 else (1 - level) / bucket.refill_per_second
+        return max(self.blocked_for(platform, action), refill)
+
+    def levels(self) -> Dict[str, Dict]:
+        """Current level, capacity and block time of every bucket"""
+        levels = {}
+        for (platform, action), bucket in self._buckets.items():
+            levels[f"{platform}.{action}"] = {
+                "available": round(self.available(platform, action), 2),
+                "capacity": bucket.capacity,
+                "blocked_for": round(self.blocked_for(platform, action))
+            }
+        return levels
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Serializable bucket levels, to carry long windows across restarts"""
+        with self._lock:
+            blocked = dict(self._blocked_until)
+        return {
+            f"{platform}.{action}": {"level": bucket.level(), "at": time.time(), "blocked_until": blocked.get((platform, action), 0.0)}
+            for (platform, action), bucket in self._buckets.items()
+        }
+
+    def restore(self, snapshot: Dict[str, Dict]):
+        """Reload levels saved by snapshot(), refilled for the time since"""
+        for name, saved in (snapshot or {}).items():
+            platform, _, action = name.partition(".")
+            bucket = self._buckets.get((platform, action))
+            if bucket is None:
+                continue
+            elapsed = max(0.0, time.time() - saved.get("at", 0.0))
+            bucket.set_level(saved.get("level", bucket.capacity) + elapsed * bucket.refill_per_second)
+            if saved.get("blocked_until", 0.0) > time.time():
+                with self._lock:
+                    self._blocked_until[(platform, action)] = saved["blocked_until"]
+
+
+def open_database(db_path: Path) -> sqlite3.Connection:
+    """Open the agent's SQLite database in WAL mode (safe to share across threads behind a lock)"""
+    conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def process_alive(pid: Optional[int]) -> bool:
+    """Whether a process with this PID is running on this host"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for prompt budgeting"""
+    return (len(text) + 3) // 4
+
+
+def read_tail(path: Path, max_bytes: int) -> str:
+    """Last max_bytes of a UTF-8 file, read by seeking from the end (never splits a character)"""
+    if not path.exists():
+        return ""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - max_bytes))
+        data = f.read()
+
+    # Drop continuation bytes of a character cut by the seek (at most 3)
+    start = 0
+    while start < min(3, len(data)) and data[start] & 0xC0 == 0x80:
+        start += 1
+    return data[start:].decode('utf-8', errors='replace')
+
+
+def read_tail_entries(path: Path, count: int, chunk_size: int = 64 * 1024) -> List[Dict]:
+    """Last `count` activity-log.md entries, reading backwards chunk by chunk"""
+    if not path.exists() or count <= 0:
+        return []
+
+    marker = b"\n## "
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+            # count + 1 markers guarantees the oldest wanted entry is complete
+            if buffer.count(marker) > count:
+                break
+
+    # Entry headers start at an ASCII newline, so cutting there is always UTF-8 safe
+    cut = len(buffer)
+    for _ in range(count):
+        cut = buffer.rfind(marker, 0, cut)
+        if cut < 0:
+            break
+    if cut > 0:
+        buffer = buffer[cut:]
+    return ActivityStore.parse_markdown(buffer.decode('utf-8', errors='replace'))[-count:]
+
+
+class StateStore(MutableMapping):
+    """
+    Dict-like agent state persisted per key in SQLite
+
+    Only keys changed since the last flush are written, each flush is one
+    transaction, and flushes requested inside a batch() are deferred until
+    the outermost batch on that thread exits. Nested values must be
+    reassigned (state[key] = value) to be marked as changed.
+    """
+
+    def __init__(self, db_path: Path, defaults: Dict, legacy_json: Optional[Path] = None):
+        self._conn = open_database(db_path)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._dirty: set = set()
+        self._deleted: set = set()
+
+        self._conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._data: Dict[str, Any] = {
+            key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM state")
+        }
+
+        if not self._data:
+            if legacy_json and legacy_json.exists():
+                # One-time migration from the old whole-file JSON state
+                with open(legacy_json, 'r') as f:
+                    self._data = json.load(f)
+                logger.info(f"Migrated state from {legacy_json.name} ({len(self._data)} keys)")
+            else:
+                self._data = dict(defaults)
+            self._dirty.update(self._data)
+            self.flush()
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._dirty.add(key)
+            self._deleted.discard(key)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            del self._data[key]
+            self._dirty.discard(key)
+            self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    @contextmanager
+    def batch(self):
+        """Defer flushes on this thread until the outermost batch exits"""
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self.flush()
+
+    def save(self):
+        """Flush now, unless this thread is inside a batch"""
+        if getattr(self._local, "depth", 0) == 0:
+            self.flush()
+
+    def flush(self):
+        """Write changed keys in a single transaction"""
+        with self._lock:
+            if not self._dirty and not self._deleted:
+                return
+            rows = [(key, json.dumps(self._data[key])) for key in self._dirty]
+            deleted = [(key,) for key in self._deleted]
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO state (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    rows
+                )
+                self._conn.executemany("DELETE FROM state WHERE key = ?", deleted)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._dirty.clear()
+            self._deleted.clear()
+            logger.debug(f"State flushed ({len(rows)} changed, {len(deleted)} removed)")
+
+    def close(self):
+        """Flush pending changes and close the database"""
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+class ActivityStore:
+    """Structured activity log in SQLite, indexed by timestamp and activity type"""
+
+    ENTRY_HEADER = re.compile(r"^## (\S+) - (\S+)\s*$")
+
+    def __init__(self, db_path: Path, legacy_markdown: Optional[Path] = None):
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS activity (
+                id INTEGER PRIMARY KEY,
+                ts REAL NOT NULL,
+                timestamp TEXT NOT NULL,
+                type TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS activity_ts ON activity (ts);
+            CREATE INDEX IF NOT EXISTS activity_type_ts ON activity (type, ts);
+        """)
+
+        empty = self._conn.execute("SELECT 1 FROM activity LIMIT 1").fetchone() is None
+        if empty and legacy_markdown and legacy_markdown.exists():
+            self._import_markdown(legacy_markdown)
+
+    @classmethod
+    def parse_markdown(cls, text: str) -> List[Dict]:
+        """Parse activity-log.md blocks (## timestamp - TYPE + message) into entries"""
+        entries = []
+        current = None
+        for line in text.splitlines():
+            match = cls.ENTRY_HEADER.match(line)
+            if match:
+                try:
+                    when = datetime.fromisoformat(match.group(1))
+                except ValueError:
+                    match = None
+            if match:
+                if current:
+                    entries.append(current)
+                current = {"timestamp": when.isoformat(), "ts": when.timestamp(), "type": match.group(2), "lines": []}
+            elif current is not None:
+                current["lines"].append(line)
+        if current:
+            entries.append(current)
+
+        for entry in entries:
+            entry["message"] = "\n".join(entry.pop("lines")).strip()
+        return entries
+
+    def _import_markdown(self, path: Path):
+        """One-time import of the existing markdown log"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            entries = self.parse_markdown(f.read())
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO activity (ts, timestamp, type, message) VALUES (?, ?, ?, ?)",
+                [(e["ts"], e["timestamp"], e["type"], e["message"]) for e in entries]
+            )
+            self._conn.execute("COMMIT")
+        logger.info(f"Imported {len(entries)} activity entries from {path.name}")
+
+    def append(self, activity_type: str, message: str, when: datetime):
+        """Record one activity entry"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO activity (ts, timestamp, type, message) VALUES (?, ?, ?, ?)",
+                (when.timestamp(), when.isoformat(), activity_type, message)
+            )
+
+    def query(self, types: Optional[List[str]] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Entries matching the filters, oldest first (the newest `limit` if given)"""
+        clauses, params = [], []
+        if types:
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(since.timestamp())
+        if until:
+            clauses.append("ts < ?")
+            params.append(until.timestamp())
+
+        sql = "SELECT timestamp, type, message FROM activity"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY ts DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [{"timestamp": ts, "type": kind, "message": message} for ts, kind, message in reversed(rows)]
+
+    @staticmethod
+    def to_markdown(entries: List[Dict]) -> str:
+        """Render entries in the activity-log.md format"""
+        return "".join(f"\n## {e['timestamp']} - {e['type']}\n{e['message']}\n" for e in entries)
+
+    def export_markdown(self, path: Path, since: Optional[datetime] = None, types: Optional[List[str]] = None) -> int:
+        """Write a human-readable markdown export, returns the entry count"""
+        entries = self.query(types=types, since=since)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_markdown(entries))
+        return len(entries)
+
+    def oldest_timestamp(self) -> Optional[datetime]:
+        """Timestamp of the oldest retained entry"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(ts) FROM activity").fetchone()
+        return datetime.fromtimestamp(row[0], timezone.utc) if row and row[0] is not None else None
+
+    def prune(self, before: datetime) -> int:
+        """Drop entries older than `before` (they live on in the archived segments)"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM activity WHERE ts < ?", (before.timestamp(),))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class ActivityArchive:
+    """Rotated, gzip-compressed activity-log.md segments described by a JSON manifest"""
+
+    def __init__(self, live_log: Path, archive_dir: Path):
+        self.live_log = live_log
+        self.archive_dir = archive_dir
+        self.manifest_file = archive_dir / "manifest.json"
+        self.archive_dir.mkdir(exist_ok=True)
+
+    def segments(self) -> List[Dict]:
+        """Archived segments, oldest first"""
+        if not self.manifest_file.exists():
+            return []
+        with open(self.manifest_file, 'r') as f:
+            return json.load(f)
+
+    def _live_started(self) -> Optional[datetime]:
+        """Timestamp of the first entry in the live log (reads only its first lines)"""
+        if not self.live_log.exists():
+            return None
+        with open(self.live_log, 'r', encoding='utf-8', errors='replace') as f:
+            for _ in range(20):
+                line = f.readline()
+                if not line:
+                    break
+                match = ActivityStore.ENTRY_HEADER.match(line.rstrip("\n"))
+                if match:
+                    try:
+                        return datetime.fromisoformat(match.group(1))
+                    except ValueError:
+                        continue
+        return None
+
+    def needs_rotation(self, max_bytes: int, max_age: timedelta) -> bool:
+        """True when the live log is over the size limit or its first entry is too old"""
+        if not self.live_log.exists():
+            return False
+        if self.live_log.stat().st_size >= max_bytes:
+            return True
+        started = self._live_started()
+        return started is not None and datetime.now(timezone.utc) - started >= max_age
+
+    def rotate(self) -> Optional[Dict]:
+        """Compress the live log into a dated segment and record it in the manifest"""
+        if not self.live_log.exists() or self.live_log.stat().st_size == 0:
+            return None
+
+        rotating = self.live_log.with_suffix(".md.rotating")
+        os.replace(self.live_log, rotating)
+
+        with open(rotating, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        entries = ActivityStore.parse_markdown(text)
+        now = datetime.now(timezone.utc)
+        start = entries[0]["timestamp"] if entries else now.isoformat()
+        end = entries[-1]["timestamp"] if entries else now.isoformat()
+
+        name = f"activity-log-{datetime.fromisoformat(start).strftime('%Y%m%dT%H%M%S')}-{now.strftime('%Y%m%dT%H%M%S')}.md.gz"
+        with gzip.open(self.archive_dir / name, 'wt', encoding='utf-8') as gz:
+            gz.write(text)
+
+        segment = {"file": name, "start": start, "end": end, "entries": len(entries), "bytes": len(text.encode('utf-8'))}
+        manifest = self.segments() + [segment]
+        tmp = self.manifest_file.with_suffix(".json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_file)
+        rotating.unlink()
+
+        return segment
+
+    def read_window(self, since: datetime, until: Optional[datetime] = None) -> List[Dict]:
+        """Entries from only the segments overlapping [since, until), oldest first"""
+        entries = []
+        for segment in self.segments():
+            if datetime.fromisoformat(segment["end"]) < since:
+                continue
+            if until and datetime.fromisoformat(segment["start"]) >= until:
+                continue
+            with gzip.open(self.archive_dir / segment["file"], 'rt', encoding='utf-8') as gz:
+                entries.extend(ActivityStore.parse_markdown(gz.read()))
+
+        return [
+            {"timestamp": e["timestamp"], "type": e["type"], "message": e["message"]}
+            for e in entries
+            if e["ts"] >= since.timestamp() and (until is None or e["ts"] < until.timestamp())
+        ]
+
+
+class ResponseCache:
+    """GET response cache keyed by endpoint: in-memory LRU front, SQLite tier that survives restarts"""
+
+    def __init__(self, db_path: Path, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached entry (body, etag, last_modified, fetched_at) or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn.execute(
+                    "SELECT body, etag, last_modified, fetched_at FROM http_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = {"body": json.loads(row[0]), "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+                    self._memory[key] = entry
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._evict()
+            return entry
+
+    def put(self, key: str, body: Any, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Store a fresh response"""
+        entry = {"body": body, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            self._evict()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache (key, body, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(body), etag, last_modified, entry["fetched_at"])
+            )
+
+    def touch(self, key: str):
+        """Mark a cached entry fresh again after a 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                self._memory[key]["fetched_at"] = now
+            self._conn.execute("UPDATE http_cache SET fetched_at = ? WHERE key = ?", (now, key))
+
+    def _evict(self):
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def prune(self, before: datetime) -> int:
+        """Drop entries last fetched or revalidated before `before`"""
+        cutoff = before.timestamp()
+        with self._lock:
+            for key in [key for key, entry in self._memory.items() if entry["fetched_at"] < cutoff]:
+                del self._memory[key]
+            cursor = self._conn.execute("DELETE FROM http_cache WHERE fetched_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def stats(self) -> Dict:
+        """Hit / revalidation / miss counters"""
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class SeenPostIndex:
+    """Persistent index of feed posts already shown to the model (post id -> first seen, replied, score)"""
+
+    def __init__(self, db_path: Path):
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_posts (
+                post_id TEXT PRIMARY KEY,
+                author TEXT,
+                first_seen REAL NOT NULL,
+                replied_at REAL,
+                score REAL
+            );
+            CREATE INDEX IF NOT EXISTS seen_posts_first_seen ON seen_posts (first_seen);
+        """)
+
+    def unseen(self, post_ids: List[str]) -> set:
+        """The subset of post_ids not yet in the index"""
+        if not post_ids:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT post_id FROM seen_posts WHERE post_id IN ({', '.join('?' * len(post_ids))})", post_ids
+            ).fetchall()
+        return set(post_ids) - {row[0] for row in rows}
+
+    def replied(self, post_ids: List[str]) -> set:
+        """The subset of post_ids we've already replied to"""
+        if not post_ids:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT post_id FROM seen_posts WHERE replied_at IS NOT NULL AND post_id IN ({', '.join('?' * len(post_ids))})",
+                post_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def mark_seen(self, posts: List[tuple]):
+        """Record (post_id, author, score) rows as seen (first-seen time is kept on repeats, score is updated)"""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO seen_posts (post_id, author, first_seen, score) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(post_id) DO UPDATE SET author = COALESCE(seen_posts.author, excluded.author), "
+                "score = COALESCE(excluded.score, seen_posts.score)",
+                [(str(post_id), author, now, score) for post_id, author, score in posts]
+            )
+
+    def mark_replied(self, post_id: str):
+        """Record that we replied to a post"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO seen_posts (post_id, first_seen, replied_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(post_id) DO UPDATE SET replied_at = excluded.replied_at",
+                (str(post_id), time.time(), time.time())
+            )
+
+    def prune(self, before: datetime) -> int:
+        """Forget posts first seen before `before`"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM seen_posts WHERE first_seen < ?", (before.timestamp(),))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class LeaderboardHistory:
+    """Time series of leaderboard snapshots (lb_snapshots) with per-agent rows indexed by name (lb_entries)"""
+
+    def __init__(self, db_path: Path):
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS lb_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                taken_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS lb_snapshots_taken_at ON lb_snapshots (taken_at);
+            CREATE TABLE IF NOT EXISTS lb_entries (
+                snapshot_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                display_name TEXT,
+                rank INTEGER NOT NULL,
+                value REAL,
+                PRIMARY KEY (snapshot_id, name)
+            );
+            CREATE INDEX IF NOT EXISTS lb_entries_name ON lb_entries (name, snapshot_id);
+        """)
+
+    def record(self, entries: List[tuple], taken_at: Optional[float] = None) -> int:
+        """Store one ranking as (name, rank, value) rows; names are matched case-insensitively"""
+        taken_at = taken_at or time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                snapshot_id = self._conn.execute("INSERT INTO lb_snapshots (taken_at) VALUES (?)", (taken_at,)).lastrowid
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO lb_entries (snapshot_id, name, display_name, rank, value) VALUES (?, ?, ?, ?, ?)",
+                    [(snapshot_id, name.lower(), name, rank, value) for name, rank, value in entries]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return snapshot_id
+
+    def _snapshot_at(self, when: Optional[float] = None) -> Optional[tuple]:
+        """(id, taken_at) of the latest snapshot at or before `when` (default: the latest overall)"""
+        query = "SELECT id, taken_at FROM lb_snapshots"
+        params: tuple = ()
+        if when is not None:
+            query += " WHERE taken_at <= ?"
+            params = (when,)
+        return self._conn.execute(query + " ORDER BY taken_at DESC LIMIT 1", params).fetchone()
+
+    def last_taken_at(self) -> Optional[float]:
+        """When the most recent snapshot was taken"""
+        with self._lock:
+            latest = self._snapshot_at()
+        return latest[1] if latest else None
+
+    def latest_ranks(self) -> Dict[str, int]:
+        """Lowercased name -> rank from the most recent snapshot"""
+        with self._lock:
+            latest = self._snapshot_at()
+            if not latest:
+                return {}
+            rows = self._conn.execute("SELECT name, rank FROM lb_entries WHERE snapshot_id = ?", (latest[0],)).fetchall()
+        return dict(rows)
+
+    def rank_history(self, name: str, since: float) -> List[tuple]:
+        """(taken_at, rank) for an agent since `since`, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT s.taken_at, e.rank FROM lb_entries e JOIN lb_snapshots s ON s.id = e.snapshot_id "
+                "WHERE e.name = ? AND s.taken_at >= ? ORDER BY s.taken_at",
+                (name.lower(), since)
+            ).fetchall()
+
+    def movers(self, since: float, limit: int = 5) -> List[Dict]:
+        """Agents whose rank changed most between the snapshot nearest `since` and the latest one"""
+        with self._lock:
+            latest = self._snapshot_at()
+            baseline = self._snapshot_at(since) or self._conn.execute(
+                "SELECT id, taken_at FROM lb_snapshots WHERE taken_at >= ? ORDER BY taken_at LIMIT 1", (since,)
+            ).fetchone()
+            if not latest or not baseline or latest[0] == baseline[0]:
+                return []
+            rows = self._conn.execute(
+                "SELECT cur.display_name, old.rank, cur.rank FROM lb_entries cur "
+                "JOIN lb_entries old ON old.name = cur.name AND old.snapshot_id = ? "
+                "WHERE cur.snapshot_id = ? AND old.rank != cur.rank "
+                "ORDER BY ABS(old.rank - cur.rank) DESC, cur.rank LIMIT ?",
+                (baseline[0], latest[0], limit)
+            ).fetchall()
+        return [{"name": name, "from": old, "to": new, "delta": old - new} for name, old, new in rows]
+
+    def agents_above(self, name: str, count: int = 3) -> List[tuple]:
+        """(name, rank) of the agents ranked just above `name` in the latest snapshot"""
+        with self._lock:
+            latest = self._snapshot_at()
+            if not latest:
+                return []
+            row = self._conn.execute(
+                "SELECT rank FROM lb_entries WHERE snapshot_id = ? AND name = ?", (latest[0], name.lower())
+            ).fetchone()
+            if not row:
+                return []
+            rows = self._conn.execute(
+                "SELECT display_name, rank FROM lb_entries WHERE snapshot_id = ? AND rank < ? ORDER BY rank DESC LIMIT ?",
+                (latest[0], row[0], count)
+            ).fetchall()
+        return list(reversed(rows))
+
+    def prune(self, before: datetime) -> int:
+        """Drop snapshots taken before `before`"""
+        with self._lock:
+            old = [row[0] for row in self._conn.execute("SELECT id FROM lb_snapshots WHERE taken_at < ?", (before.timestamp(),))]
+            if old:
+                placeholders = ", ".join("?" * len(old))
+                self._conn.execute(f"DELETE FROM lb_entries WHERE snapshot_id IN ({placeholders})", old)
+                self._conn.execute(f"DELETE FROM lb_snapshots WHERE id IN ({placeholders})", old)
+        return len(old)
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class NotificationStore:
+    """
+    Persistent priority inbox of actionable notifications (queued -> claimed -> attempting -> replied / skipped)
+
+    Every notification id ever stored counts as seen, so a notification is
+    never replied to twice. A claim is marked attempting just before its
+    reply is posted; from then on it is only undone by an explicit
+    release(), never by a restart, so a crash mid-reply can't cause a
+    second reply. Claims that were never attempted and are older than the
+    lease go back to the queue on startup. Queued items are served by
+    score, decayed by age, with per-actor fairness.
+    """
+
+    def __init__(self, db_path: Path, max_attempts: int = 3, claim_lease_seconds: float = 600.0):
+        self.max_attempts = max_attempts
+        self.claim_lease_seconds = claim_lease_seconds
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS notifications (
+                id TEXT PRIMARY KEY,
+                type TEXT,
+                actor TEXT,
+                payload TEXT NOT NULL,
+                created_at TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                received_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS notifications_status ON notifications (status, created_at);
+        """)
+        # Priority columns (added after the table first shipped)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notifications)")}
+        if "score" not in columns:
+            self._conn.execute("ALTER TABLE notifications ADD COLUMN score REAL NOT NULL DEFAULT 0")
+        if "created_ts" not in columns:
+            self._conn.execute("ALTER TABLE notifications ADD COLUMN created_ts REAL")
+        self.requeue_stale_claims()
+
+    def requeue_stale_claims(self) -> int:
+        """Return claims that were never attempted (their process died first) to the queue"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE notifications SET status = 'queued', updated_at = ? WHERE status = 'claimed' AND updated_at < ?",
+                (time.time(), time.time() - self.claim_lease_seconds)
+            )
+        if cursor.rowcount:
+            logger.info(f"🔔 Requeued {cursor.rowcount} notification claim(s) never attempted before a restart")
+        return cursor.rowcount
+
+    def known(self, notif_ids: List[str]) -> set:
+        """The subset of notif_ids already stored (in any status)"""
+        if not notif_ids:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM notifications WHERE id IN ({', '.join('?' * len(notif_ids))})", notif_ids
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _timestamp(value) -> Optional[float]:
+        """Epoch seconds from an ISO created_at, if it parses"""
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp() if value else None
+        except ValueError:
+            return None
+
+    def add(self, notifications: List[tuple], status: str = "queued", scores: Optional[Dict[str, float]] = None) -> int:
+        """Store (id, notification) pairs not seen before, with their base scores; returns how many were new"""
+        now = time.time()
+        scores = scores or {}
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO notifications "
+                "(id, type, actor, payload, created_at, created_ts, score, status, received_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (notif_id, n.get('type'), (n.get('actor') or {}).get('name'), json.dumps(n), n.get('created_at'),
+                     self._timestamp(n.get('created_at')) or now, scores.get(notif_id, 0.0), status, now, now)
+                    for notif_id, n in notifications
+                ]
+            )
+            return self._conn.total_changes - before
+
+    def claim(self, limit: int, max_per_actor: int = 1, age_penalty_per_hour: float = 5.0,
+              recent_reply_penalty: float = 20.0, actor_bonus: Optional[Dict[str, float]] = None) -> List[tuple]:
+        """
+        Take the `limit` highest-priority queued notifications as (id, notification)
+
+        Priority is the stored base score plus the actor's current bonus
+        (actor_bonus: lowercased name -> points), minus an hourly age penalty,
+        minus a penalty per reply we sent the same actor in the last hour.
+        Each actor gets at most max_per_actor slots unless there's spare
+        capacity; notifications without an actor are capped individually.
+        The whole queue is ranked in SQL, so fairness never works from a
+        truncated candidate list.
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute("""
+                WITH recent AS (
+                    SELECT actor, COUNT(*) AS replies FROM notifications
+                    WHERE status = 'replied' AND actor IS NOT NULL AND updated_at > ? GROUP BY actor
+                ), scored AS (
+                    SELECT n.id, n.payload, n.actor IS NULL AS anonymous, COALESCE(n.actor, n.id) AS bucket,
+                           n.score + COALESCE(b.value, 0)
+                               - (? - COALESCE(n.created_ts, n.received_at)) / 3600.0 * ?
+                               - ? * COALESCE(r.replies, 0) AS priority
+                    FROM notifications n
+                    LEFT JOIN recent r ON r.actor = n.actor
+                    LEFT JOIN json_each(?) b ON b.key = LOWER(n.actor)
+                    WHERE n.status = 'queued'
+                ), slotted AS (
+                    SELECT id, payload, priority,
+                           ROW_NUMBER() OVER (PARTITION BY anonymous, bucket ORDER BY priority DESC, id) AS slot
+                    FROM scored
+                )
+                -- Capped picks first, then spare capacity to the best of what the cap held back
+                SELECT id, payload FROM slotted ORDER BY slot > ?, priority DESC, id LIMIT ?
+            """, (now - 3600, now, age_penalty_per_hour, recent_reply_penalty, json.dumps(actor_bonus or {}),
+                  max_per_actor, limit)).fetchall()
+
+            self._conn.executemany(
+                "UPDATE notifications SET status = 'claimed', updated_at = ? WHERE id = ?",
+                [(now, row[0]) for row in rows]
+            )
+        return [(notif_id, json.loads(payload)) for notif_id, payload in rows]
+
+    def attempting(self, notif_id: str):
+        """Record that a reply to a claimed notification is about to be posted (a restart won't requeue it now)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notifications SET status = 'attempting', updated_at = ? WHERE id = ? AND status = 'claimed'",
+                (time.time(), notif_id)
+            )
+
+    def finish(self, notif_id: str, status: str = "replied"):
+        """Mark a claimed notification as handled"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notifications SET status = ?, updated_at = ? WHERE id = ?", (status, time.time(), notif_id)
+            )
+
+    def release(self, notif_id: str) -> str:
+        """
+        Return a claimed notification to the queue
+
+        Only a failed attempt (status 'attempting') counts toward max_attempts
+        and can get it skipped; a claim that was never tried goes back as is.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT attempts, status FROM notifications WHERE id = ?", (notif_id,)).fetchone()
+            attempted = row is not None and row[1] == "attempting"
+            attempts = (row[0] if row else 0) + (1 if attempted else 0)
+            status = "skipped" if attempted and attempts >= self.max_attempts else "queued"
+            self._conn.execute(
+                "UPDATE notifications SET status = ?, attempts = ?, updated_at = ? WHERE id = ?",
+                (status, attempts, time.time(), notif_id)
+            )
+        return status
+
+    def backlog(self) -> int:
+        """Notifications still waiting for a reply"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM notifications WHERE status = 'queued'").fetchone()[0]
+
+    def prune(self, before: datetime) -> int:
+        """Forget handled notifications last touched before `before`"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM notifications WHERE status != 'queued' AND updated_at < ?", (before.timestamp(),)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
+
+class OutboundQueue:
+    """
+    Durable per-platform post jobs (one per platform for each dual-post)
+
+    Jobs move pending -> in_flight -> done, or back to pending with a
+    backoff until max_attempts, then failed. A pending job past its
+    expires_at is never sent (expired), and one replaced by a newer job of
+    the same source and platform is superseded. Jobs of one dual-post share
+    a group_id. An in_flight job records the PID that claimed it and is
+    only recovered once that process has exited or the lease has expired,
+    so several processes (daemon, catch-up scripts) can share the queue.
+    """
+
+    def __init__(self, db_path: Path, max_attempts: int = 8, retry_base_seconds: float = 60.0,
+                 lease_seconds: float = 900.0):
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.lease_seconds = lease_seconds
+        self._conn = open_database(db_path)
+        self._lock = threading.Lock()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbound_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_id TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                source TEXT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_eligible REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS outbound_jobs_due ON outbound_jobs (status, next_eligible);
+            CREATE INDEX IF NOT EXISTS outbound_jobs_group ON outbound_jobs (group_id);
+        """)
+        # Claim owner (added after the table first shipped)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbound_jobs)")}
+        if "owner_pid" not in columns:
+            self._conn.execute("ALTER TABLE outbound_jobs ADD COLUMN owner_pid INTEGER")
+        if "expires_at" not in columns:
+            self._conn.execute("ALTER TABLE outbound_jobs ADD COLUMN expires_at REAL")
+        self.recover_stale()
+
+    def recover_stale(self) -> int:
+        """Put in_flight jobs whose claiming process died (or whose lease expired) back in line"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, owner_pid, updated_at FROM outbound_jobs WHERE status = 'in_flight'"
+            ).fetchall()
+            stale = [
+                (now, job_id) for job_id, owner_pid, updated_at in rows
+                if updated_at < now - self.lease_seconds or (owner_pid is not None and not process_alive(owner_pid))
+            ]
+            self._conn.executemany(
+                "UPDATE outbound_jobs SET status = 'pending', owner_pid = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'in_flight'",
+                stale
+            )
+        if stale:
+            logger.warning(f"📮 Recovered {len(stale)} outbound job(s) abandoned mid-send")
+        return len(stale)
+
+    @staticmethod
+    def _row(row) -> Dict:
+        keys = ("id", "group_id", "platform", "source", "payload", "status", "attempts", "next_eligible")
+        job = dict(zip(keys, row))
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def enqueue(self, platform: str, source: str, payload: Dict, group_id: str, delay: float = 0.0,
+                ttl: Optional[float] = None, supersede: bool = False) -> int:
+        """
+        Add a job, eligible after `delay` seconds and dropped if still unsent after `ttl`
+
+        With supersede=True, pending jobs of the same source and platform are
+        dropped in favour of this one.
+        """
+        now = time.time()
+        with self._lock:
+            if supersede:
+                self._conn.execute(
+                    "UPDATE outbound_jobs SET status = 'superseded', updated_at = ? "
+                    "WHERE source = ? AND platform = ? AND status = 'pending'",
+                    (now, source, platform)
+                )
+            cursor = self._conn.execute(
+                "INSERT INTO outbound_jobs (group_id, platform, source, payload, next_eligible, expires_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (group_id, platform, source, json.dumps(payload), now + delay, now + ttl if ttl else None, now, now)
+            )
+        return cursor.lastrowid
+
+    def _expire(self, now: float):
+        """Mark pending jobs past their expiry as expired (caller holds the lock)"""
+        cursor = self._conn.execute(
+            "UPDATE outbound_jobs SET status = 'expired', updated_at = ? "
+            "WHERE status = 'pending' AND expires_at IS NOT NULL AND expires_at <= ?",
+            (now, now)
+        )
+        if cursor.rowcount:
+            logger.info(f"📮 Dropped {cursor.rowcount} outbound job(s) that expired before they could be sent")
+
+    def claim(self, job_id: int) -> Optional[Dict]:
+        """Take a specific pending job (None if someone else has it, it's finished or it has expired)"""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            cursor = self._conn.execute(
+                "UPDATE outbound_jobs SET status = 'in_flight', owner_pid = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                (os.getpid(), now, job_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute(
+                "SELECT id, group_id, platform, source, payload, status, attempts, next_eligible FROM outbound_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._row(row)
+
+    def claim_due(self, limit: int = 5) -> List[Dict]:
+        """Take up to `limit` pending jobs whose next_eligible time has passed, oldest first"""
+        self.recover_stale()
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire(now)
+                rows = self._conn.execute(
+                    "SELECT id, group_id, platform, source, payload, status, attempts, next_eligible FROM outbound_jobs "
+                    "WHERE status = 'pending' AND next_eligible <= ? ORDER BY next_eligible, id LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbound_jobs SET status = 'in_flight', owner_pid = ?, updated_at = ? WHERE id = ?",
+                    [(os.getpid(), now, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [self._row(row) for row in rows]
+
+    def complete(self, job_id: int):
+        """Mark a job as sent"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbound_jobs SET status = 'done', attempts = attempts + 1, updated_at = ?, last_error = NULL WHERE id = ?",
+                (time.time(), job_id)
+            )
+
+    def release(self, job_id: int, delay: float):
+        """Put a job back without counting an attempt (e.g. it would exceed a rate limit)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbound_jobs SET status = 'pending', next_eligible = ?, updated_at = ? WHERE id = ?",
+                (time.time() + delay, time.time(), job_id)
+            )
+
+    def retry(self, job_id: int, error: str) -> Optional[float]:
+        """Count a failed attempt; returns the backoff before the next one, or None once the job has failed for good"""
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM outbound_jobs WHERE id = ?", (job_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            if attempts >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE outbound_jobs SET status = 'failed', attempts = ?, updated_at = ?, last_error = ? WHERE id = ?",
+                    (attempts, time.time(), error, job_id)
+                )
+                return None
+            delay = min(6 * 3600, self.retry_base_seconds * 2 ** (attempts - 1)) * random.uniform(0.75, 1.25)
+            self._conn.execute(
+                "UPDATE outbound_jobs SET status = 'pending', attempts = ?, next_eligible = ?, updated_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (attempts, time.time() + delay, time.time(), error, job_id)
+            )
+        return delay
+
+    def group_sent(self, group_id: str, exclude_id: Optional[int] = None) -> bool:
+        """Whether any platform job of this dual-post (other than exclude_id) has been sent"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM outbound_jobs WHERE group_id = ? AND status = 'done' AND id != ? LIMIT 1",
+                (group_id, exclude_id or -1)
+            ).fetchone()
+        return row is not None
+
+    def group_of(self, job_id: int) -> Optional[str]:
+        """group_id of a job"""
+        with self._lock:
+            row = self._conn.execute("SELECT group_id FROM outbound_jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def next_due(self) -> Optional[float]:
+        """Earliest next_eligible time (epoch seconds) among pending jobs"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_eligible) FROM outbound_jobs WHERE status = 'pending'").fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbound_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def prune(self, before: datetime) -> int:
+        """Drop finished (done, failed, expired or superseded) jobs last touched before `before`"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM outbound_jobs WHERE status IN ('done', 'failed', 'expired', 'superseded') AND updated_at < ?",
+                (before.timestamp(),)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
+
 
 class MoltMediaAgent:
     """Autonomous AI news agency agent"""
@@ -42,7 +1711,8 @@ class MoltMediaAgent:
         self.dry_run = dry_run
         self.base_dir = Path(__file__).parent
         self.memory_dir = self.base_dir / "memory"
-        self.state_file = self.memory_dir / "agent_state.json"
+        self.state_file = self.memory_dir / "agent_state.json"  # legacy, migrated on first start
+        self.db_file = self.memory_dir / "molt_media.db"
         self.activity_log = self.memory_dir / "activity-log.md"
 
         # Ensure memory directory exists
@@ -69,12 +1739,76 @@ class MoltMediaAgent:
         self.anthropic_client = anthropic.Anthropic()  # Uses ANTHROPIC_API_KEY env var
         logger.info("Anthropic client initialized (Claude Haiku 4.5)")
 
+        # Shared HTTP transport (keep-alive connection pool per host) for both platforms
+        self.http = HttpTransport(
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+            read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "30")),
+            pool_size=int(os.getenv("HTTP_POOL_SIZE", "10")),
+            retry_policy=RetryPolicy(
+                attempts=int(os.getenv("HTTP_RETRY_ATTEMPTS", "3")),
+                base_delay=float(os.getenv("HTTP_RETRY_BASE_DELAY", "1")),
+                max_delay=float(os.getenv("HTTP_RETRY_MAX_DELAY", "30")),
+                max_total_delay=float(os.getenv("HTTP_RETRY_MAX_TOTAL_DELAY", "30"))
+            ),
+            breaker_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")),
+            breaker_reset_seconds=float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+        )
+
+        # Reply fan-out: bounded concurrency (reply quota is paced by the rate limiter below)
+        self.reply_max_in_flight = int(os.getenv("REPLY_MAX_IN_FLIGHT", "4"))
+
+        # Client-side view of each platform's rate limits (restored from state once it's loaded)
+        self.rate_limiter = RateLimiter(PLATFORM_RATE_LIMITS)
+
+        # Guards state/activity-log writes from concurrent workers
+        self._state_lock = threading.RLock()
+
+        # Scheduler: wake-up channel (SIGUSR1 from the chat UI) and per-job rerun floor
+        self.pid_file = self.base_dir / "agent.pid"
+        self._wake_event = threading.Event()
+        self._job_rerun_after: Dict[str, datetime] = {}
+        self._job_last_run: Dict[str, str] = {}
+
         # Load personality
         self.system_prompt = self._load_personality()
 
+        # Memoized LLM responses for repeated identical prompts
+        self.llm_cache = LLMResponseCache(self.db_file, max_entries=LLM_CACHE_SIZE, ttl_seconds=LLM_CACHE_TTL)
+
+        # Name of the job running on this thread, for per-job LLM usage accounting
+        self._llm_context = threading.local()
+        self._budget_scale_logged = 1.0
+
         # Load or initialize state
         self.state = self._load_state()
 
+        self.rate_limiter.restore(self.state.get("rate_limits"))
+
+        # Structured activity log (activity-log.md stays as the human-readable copy)
+        self.activity = ActivityStore(self.db_file, legacy_markdown=self.activity_log)
+        self.activity_archive = ActivityArchive(self.activity_log, self.memory_dir / "activity-archive")
+
+        # Cache for read endpoints (feed, leaderboard)
+        self.response_cache = ResponseCache(self.db_file)
+
+        # Feed posts already evaluated by the wire scan
+        self.seen_posts = SeenPostIndex(self.db_file)
+
+        # Per-platform post jobs; failed or rate-limited halves of a dual-post are retried from here.
+        # A dry run gets its own in-memory queue so it never claims (and "sends") the live daemon's jobs
+        self.outbound = OutboundQueue(Path(":memory:") if dry_run else self.db_file, max_attempts=OUTBOUND_MAX_ATTEMPTS,
+                                      retry_base_seconds=OUTBOUND_RETRY_BASE_SECONDS,
+                                      lease_seconds=OUTBOUND_LEASE_SECONDS)
+
+        # Notification inbox: dedup by id plus overflow carried between engagement loops
+        self.notifications = NotificationStore(self.db_file, claim_lease_seconds=NOTIF_CLAIM_LEASE_SECONDS)
+
+        # Leaderboard time series (answers rank/mover questions without hitting the API)
+        self.leaderboard = LeaderboardHistory(self.db_file)
+
+        # Long-lived so a platform write that outlives its timeout never blocks the caller
+        self.post_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="post")
+
         # Load classifieds
         self.classifieds_file = self.base_dir / "classifieds.json"
 
@@ -95,14 +1829,10 @@ class MoltMediaAgent:
 
         return "\n\n".join(content_parts)
 
-    def _load_state(self) -> Dict:
+    def _load_state(self) -> StateStore:
         """Load agent state from disk"""
-        if self.state_file.exists():
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
-
         # Initialize default state
-        return {
+        defaults = {
             "last_wire_scan": None,
             "last_editorial_board": None,
             "last_owner_brief": None,
@@ -117,171 +1847,374 @@ class MoltMediaAgent:
             "total_sunday_papers": 0
         }
 
+        return StateStore(self.db_file, defaults, legacy_json=self.state_file)
+
     def _save_state(self):
-        """Save agent state to disk"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        """Persist changed state keys (deferred to the end of the current job's batch)"""
+        self.state.save()
         logger.debug("State saved")
 
+    def _recent_activity(self, hours: float, types: Optional[List[str]] = None, max_chars: int = 3000) -> str:
+        """Markdown for the last N hours of activity, newest entries kept whole within max_chars"""
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        try:
+            entries = self.activity.query(types=types, since=since)
+
+            # Windows reaching past the retained rows pull in just the archived segments they need
+            oldest = self.activity.oldest_timestamp()
+            if oldest is None or since < oldest:
+                archived = self.activity_archive.read_window(since, until=oldest)
+                entries = [e for e in archived if not types or e["type"] in types] + entries
+        except sqlite3.Error as e:
+            # Store unavailable: fall back to the tail of the live markdown log
+            logger.error(f"Activity store query failed, reading log tail instead: {e}")
+            return read_tail(self.activity_log, max_chars * 4)[-max_chars:]
+
+        kept, size = [], 0
+        for entry in reversed(entries):
+            block = ActivityStore.to_markdown([entry])
+            if kept and size + len(block) > max_chars:
+                break
+            kept.append(entry)
+            size += len(block)
+
+        return ActivityStore.to_markdown(list(reversed(kept)))[-max_chars:]
+
+    def _maintain_activity_log(self):
+        """Rotate activity-log.md into compressed segments and compact the activity store"""
+        with self._state_lock:
+            if self.activity_archive.needs_rotation(ACTIVITY_LOG_MAX_BYTES, timedelta(hours=ACTIVITY_LOG_MAX_AGE_HOURS)):
+                segment = self.activity_archive.rotate()
+                if segment:
+                    logger.info(f"🗜️  Rotated activity log: {segment['file']} ({segment['entries']} entries)")
+
+        # Only drop rows that an archived segment already covers
+        segments = self.activity_archive.segments()
+        if segments:
+            archived_until = datetime.fromisoformat(segments[-1]["end"])
+            cutoff = min(datetime.now(timezone.utc) - timedelta(days=ACTIVITY_RETENTION_DAYS), archived_until)
+            pruned = self.activity.prune(cutoff)
+            if pruned:
+                logger.info(f"🗜️  Compacted activity store: dropped {pruned} entries before {cutoff.date()}")
+
+        # Old posts never resurface in the feed cursor window
+        self.seen_posts.prune(datetime.now(timezone.utc) - timedelta(days=14))
+        # Entries not read for a day (e.g. pages past our leaderboard neighbourhood) only take up space
+        self.response_cache.prune(datetime.now(timezone.utc) - timedelta(days=1))
+        self.outbound.prune(datetime.now(timezone.utc) - timedelta(days=14))
+        self.notifications.prune(datetime.now(timezone.utc) - timedelta(days=14))
+        self.leaderboard.prune(datetime.now(timezone.utc) - timedelta(days=LEADERBOARD_HISTORY_DAYS))
+        self.llm_cache.prune()
+
+    def _increment_state(self, key: str, amount: int = 1):
+        """Atomically bump a counter in state (safe from worker threads)"""
+        with self._state_lock:
+            self.state[key] = self.state.get(key, 0) + amount
+
     def _log_activity(self, activity_type: str, message: str):
-        """Log activity to activity-log.md"""
-        timestamp = datetime.now(timezone.utc).isoformat()
-        log_entry = f"\n## {timestamp} - {activity_type}\n{message}\n"
+        """Log activity to the activity store and activity-log.md"""
+        now = datetime.now(timezone.utc)
+        log_entry = f"\n## {now.isoformat()} - {activity_type}\n{message}\n"
 
-        with open(self.activity_log, 'a') as f:
-            f.write(log_entry)
+        with self._state_lock:
+            self.activity.append(activity_type, message, now)
+            with open(self.activity_log, 'a') as f:
+                f.write(log_entry)
 
         logger.info(f"[{activity_type}] {message}")
 
-    def _call_llm(self, prompt: str, temperature: float = 0.8, max_tokens: int = 1024, use_full_context: bool = False) -> Optional[str]:
-        """Call Claude Haiku 4.5 via Anthropic API"""
-        # Use minimal context by default to save tokens
-        if use_full_context:
-            system_content = self.system_prompt
-        else:
-            # Minimal context - ENGAGEMENT FOCUSED
-            system_content = """You're Hank from Molt Media. You're the local paper guy who ACTUALLY TALKS TO PEOPLE.
-
-CORE MISSION: Build a community around your feed. Make people want to be part of the conversation.
-
-HOW TO TALK:
-- Replies: ONE SENTENCE. Period. Max 15 words. Be punchy.
-- Posts: End with a question. Get people talking.
-- Tone: Like a friend, not a news anchor. "yo" not "greetings"
-
-NEVER DO:
-- Write more than 1 sentence in a reply
-- Sound like ChatGPT (no "great question!" or "that's a crucial insight")
-- Use words like: profound, dichotomy, implications, crucial, indeed
-- Write essays when a one-liner works
+    def _call_llm(self, prompt: str, temperature: float = 0.8, max_tokens: int = 1024, use_full_context: bool = False,
+                  cache: bool = False, site: str = "other", is_valid=None) -> Optional[str]:
+        """
+        Call Claude Haiku 4.5 via Anthropic API
 
-ALWAYS DO:
-- Reply to people who engage with you
-- Ask questions to spark discussion
-- Tag specific molts, call them out, make it personal
-- Have opinions, take sides, be interesting
+        With cache=True, identical calls are served from the response cache.
+        Only opt in for deterministic prompts; a response is stored only if
+        is_valid(content) accepts it, so a bad answer isn't replayed on retry.
+        """
+        # Use minimal context by default to save tokens
+        system_content = self.system_prompt if use_full_context else HANK_SYSTEM_PROMPT
+        model = "claude-haiku-4-5-20251001"
 
-You grow by being someone people want to talk to, not by broadcasting."""
+        cache_key = LLMResponseCache.make_key(model, system_content, prompt, temperature, max_tokens) if cache else None
+        if cache_key:
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM response cache hit")
+                return cached
 
+        started = time.monotonic()
         try:
             response = self.anthropic_client.messages.create(
-                model="claude-haiku-4-5-20251001",
+                model=model,
                 max_tokens=max_tokens,
                 system=system_content,
                 messages=[{"role": "user", "content": prompt}]
             )
+            self._record_llm_usage(site, response.usage, time.monotonic() - started)
             content = response.content[0].text
             logger.debug(f"Claude Haiku response: {content[:100]}...")
+            if cache_key and (is_valid is None or is_valid(content)):
+                self.llm_cache.put(cache_key, content)
             return content
 
         except Exception as e:
             logger.error(f"Anthropic API error: {e}")
             return None
 
+    def _stream_llm(self, prompt: str, max_tokens: int = 1024, use_full_context: bool = False,
+                    on_text=None, max_seconds: Optional[float] = None, site: str = "other") -> Optional[str]:
+        """
+        Stream a completion, calling on_text(chunk, text_so_far) as tokens arrive
+
+        Stops early once max_seconds have passed and returns what arrived,
+        trimmed to the last paragraph break. Returns None if nothing arrived.
+        """
+        system_content = self.system_prompt if use_full_context else HANK_SYSTEM_PROMPT
+        started = time.monotonic()
+        deadline = started + max_seconds if max_seconds else None
+        text = ""
+        cut_off = False
+        stream = None
+        usage_recorded = False
+
+        try:
+            with self.anthropic_client.messages.stream(
+                model="claude-haiku-4-5-20251001",
+                max_tokens=max_tokens,
+                system=system_content,
+                messages=[{"role": "user", "content": prompt}]
+            ) as stream:
+                for chunk in stream.text_stream:
+                    text += chunk
+                    if on_text:
+                        on_text(chunk, text)
+                    if deadline and time.monotonic() > deadline:
+                        cut_off = True
+                        break
+
+                if not cut_off:
+                    final = stream.get_final_message()
+                    self._record_llm_usage(site, final.usage, time.monotonic() - started)
+                    usage_recorded = True
+                    # A max_tokens stop ends mid-sentence - trim it like a deadline cut
+                    cut_off = final.stop_reason == "max_tokens"
+
+        except Exception as e:
+            logger.error(f"Anthropic streaming error: {e}")
+            cut_off = bool(text)
+
+        # A stream that stopped early never reports its final usage, but the tokens were still spent
+        if stream is not None and not usage_recorded:
+            self._record_llm_usage(site, self._partial_usage(stream, system_content + prompt, text), time.monotonic() - started)
+
+        if not text:
+            return None
+
+        if cut_off:
+            paragraph_end = text.rfind("\n\n")
+            if paragraph_end > len(text) // 2:
+                text = text[:paragraph_end]
+            logger.warning(f"Streaming stopped early - keeping {len(text)} chars")
+
+        return text
+
+    @staticmethod
+    def _partial_usage(stream, sent: str, received: str):
+        """Usage of an unfinished stream: the snapshot's counts where the API sent them, else estimates"""
+        try:
+            snapshot = stream.current_message_snapshot.usage
+        except Exception:
+            snapshot = None
+        return SimpleNamespace(
+            input_tokens=getattr(snapshot, "input_tokens", 0) or estimate_tokens(sent),
+            output_tokens=max(getattr(snapshot, "output_tokens", 0) or 0, estimate_tokens(received))
+        )
+
+    def _current_job(self) -> str:
+        """Name of the job running on this thread"""
+        return getattr(self._llm_context, "job", None) or "other"
+
+    def _record_llm_usage(self, site: str, usage, latency: float):
+        """Add one call's tokens and latency to today's per-job and per-call-site totals in state"""
+        if usage is None:
+            return
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        # Cache reads are billed at a tenth of the input rate, so they count a tenth toward the budget
+        billed = input_tokens + cache_write + output_tokens + cache_read // 10
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        with self._state_lock:
+            usage_by_day = dict(self.state.get("llm_usage", {}))
+            day = usage_by_day.get(today, {"tokens": 0, "jobs": {}, "sites": {}})
+
+            for group, name in (("jobs", self._current_job()), ("sites", site)):
+                totals = dict(day[group].get(name, {"calls": 0, "input_tokens": 0, "output_tokens": 0,
+                                                    "cached_tokens": 0, "latency_ms": 0}))
+                totals["calls"] += 1
+                totals["input_tokens"] += input_tokens + cache_write
+                totals["output_tokens"] += output_tokens
+                totals["cached_tokens"] += cache_read
+                totals["latency_ms"] += int(latency * 1000)
+                day[group] = {**day[group], name: totals}
+
+            day["tokens"] += billed
+            usage_by_day[today] = day
+            # Nested dicts are reassigned whole so the state store sees the change
+            self.state["llm_usage"] = {d: usage_by_day[d] for d in sorted(usage_by_day)[-LLM_USAGE_HISTORY_DAYS:]}
+
+    def _tokens_used_today(self) -> int:
+        """Budget-weighted LLM tokens spent since midnight UTC"""
+        today = datetime.now(timezone.utc).date().isoformat()
+        return self.state.get("llm_usage", {}).get(today, {}).get("tokens", 0)
+
+    def _token_budget_scale(self) -> float:
+        """1.0 comfortably under DAILY_TOKEN_BUDGET, 0.5 past 75% of it, 0.25 once it is spent"""
+        if DAILY_TOKEN_BUDGET <= 0:
+            return 1.0
+
+        used = self._tokens_used_today() / DAILY_TOKEN_BUDGET
+        scale = 1.0 if used < 0.75 else 0.5 if used < 1.0 else 0.25
+        if scale != self._budget_scale_logged:
+            self._budget_scale_logged = scale
+            logger.warning(f"🪙 LLM budget {used:.0%} used today - running at {scale:.0%} output")
+        return scale
+
+    def _budgeted(self, amount: int, floor: int = 1) -> int:
+        """Scale a reply count or token limit down to today's budget level"""
+        return max(floor, int(amount * self._token_budget_scale()))
+
     # Backward compatibility alias
     def _call_groq(self, *args, **kwargs):
         """Deprecated: Use _call_llm instead"""
         return self._call_llm(*args, **kwargs)
 
-    def _call_moltx_api(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None) -> Optional[Dict]:
-        """Make API call to MoltX"""
-        base_url = "https://moltx.io"
-        url = f"{base_url}{endpoint}"
+    @staticmethod
+    def _rate_action(endpoint: str, method: str, data: Optional[Dict]) -> str:
+        """Rate-limit bucket a platform call draws from"""
+        if method == "POST" and endpoint.rstrip("/").endswith("/posts"):
+            return "reply" if (data or {}).get("type") == "reply" else "post"
+        if "/like" in endpoint:
+            return "like"
+        if endpoint.startswith("/v1/notifications/read"):
+            return "notification_read"
+        return "other"
+
+    def _platform_request(self, platform: str, url: str, method: str, api_key: Optional[str],
+                          data: Optional[Dict] = None, cache_ttl: Optional[float] = None,
+                          action: str = "other") -> Optional[Dict]:
+        """Send a request (with retries) through the shared transport and decode the JSON body"""
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
 
-        cmd = ["curl", "-s", "-X", method]
-        cmd.extend(["-H", f"Authorization: Bearer {self.moltx_api_key}"])
-        cmd.extend(["-H", "Content-Type: application/json"])
+        # Cached GETs: serve fresh entries directly, revalidate stale ones
+        cache_key = f"{platform}:{url}" if cache_ttl is not None and method == "GET" else None
+        cached = self.response_cache.get(cache_key) if cache_key else None
+        if cached:
+            if time.time() - cached["fetched_at"] < cache_ttl:
+                self.response_cache.hits += 1
+                logger.debug(f"Cache hit: {url}")
+                return cached["body"]
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Over-limit calls are deferred here rather than spent on a guaranteed 429
+        if not self.rate_limiter.try_acquire(platform, action):
+            raise RateLimitExceeded(f"{platform} {action} limit reached")
+
+        # Retries and backoff run on the calling thread (post_pool, reply fan-out, async job threads), capped in
+        # total; on the scheduler thread they're deferred and the heap reruns the still-due job instead
+        response = self.http.request_with_retry(method, url, headers=headers, data=data)
+        self.rate_limiter.observe(platform, action, response)
+
+        if cached and response.status_code == 304:
+            self.response_cache.revalidated += 1
+            self.response_cache.touch(cache_key)
+            return cached["body"]
+
+        if response.status_code >= 400:
+            logger.error(f"{platform} API error: HTTP {response.status_code} {response.text[:200]}")
+            return None
 
-        if data:
-            cmd.extend(["-d", json.dumps(data)])
+        body = response.json() if response.content else None
 
-        cmd.append(url)
+        if cache_key and body is not None:
+            self.response_cache.misses += 1
+            self.response_cache.put(cache_key, body, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+        return body
+
+    def _call_moltx_api(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None,
+                        cache_ttl: Optional[float] = None) -> Optional[Dict]:
+        """Make API call to MoltX (GETs with a cache_ttl go through the response cache)"""
+        base_url = "https://moltx.io"
+        url = f"{base_url}{endpoint}"
 
         try:
             if self.dry_run:
                 logger.info(f"[DRY RUN] Would call MoltX: {method} {endpoint}")
                 return {"dry_run": True}
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            return self._platform_request("MoltX", url, method, self.moltx_api_key, data, cache_ttl=cache_ttl,
+                                          action=self._rate_action(endpoint, method, data))
 
-            if result.returncode != 0:
-                logger.error(f"MoltX API error: {result.stderr}")
-                return None
-
-            return json.loads(result.stdout) if result.stdout else None
-
-        except subprocess.TimeoutExpired:
+        except RateLimitExceeded as e:
+            logger.info(f"🚦 Deferred MoltX {method} {endpoint}: {e}")
+            return None
+        except CircuitOpenError:
+            logger.warning(f"MoltX unavailable (circuit open) - skipping {method} {endpoint}")
+            return None
+        except requests.Timeout:
             logger.error("MoltX API timeout")
             return None
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"Failed to parse MoltX response: {e}")
             return None
         except Exception as e:
             logger.error(f"MoltX API call failed: {e}")
             return None
 
-    def _call_moltbook_api(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None, retries: int = 3) -> Optional[Dict]:
-        """Make API call to Moltbook with retry logic"""
+    def _call_moltbook_api(self, endpoint: str, method: str = "GET", data: Optional[Dict] = None) -> Optional[Dict]:
+        """Make API call to Moltbook (transient failures are retried by the transport)"""
         base_url = "https://www.moltbook.com/api/v1"
         url = f"{base_url}{endpoint}"
 
-        cmd = ["curl", "-s", "-X", method]
-        cmd.extend(["-H", f"Authorization: Bearer {self.moltbook_api_key}"])
-        cmd.extend(["-H", "Content-Type: application/json"])
-
-        if data:
-            cmd.extend(["-d", json.dumps(data)])
-
-        cmd.append(url)
-
-        for attempt in range(retries):
-            try:
-                if self.dry_run:
-                    logger.info(f"[DRY RUN] Would call Moltbook: {method} {endpoint}")
-                    return {"dry_run": True}
-
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-                if result.returncode != 0:
-                    logger.error(f"Moltbook API error (attempt {attempt + 1}/{retries}): {result.stderr}")
-                    if attempt < retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                        continue
-                    return None
-
-                response = json.loads(result.stdout) if result.stdout else None
+        try:
+            if self.dry_run:
+                logger.info(f"[DRY RUN] Would call Moltbook: {method} {endpoint}")
+                return {"dry_run": True}
 
-                # Check if successful
-                if response and response.get("success"):
-                    return response
-                else:
-                    logger.error(f"Moltbook API returned error (attempt {attempt + 1}/{retries}): {response}")
-                    if attempt < retries - 1:
-                        time.sleep(2 ** attempt)
-                        continue
-                    return None
+            response = self._platform_request("Moltbook", url, method, self.moltbook_api_key, data,
+                                              action=self._rate_action(endpoint, method, data))
 
-            except subprocess.TimeoutExpired:
-                logger.error(f"Moltbook API timeout (attempt {attempt + 1}/{retries})")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse Moltbook response (attempt {attempt + 1}/{retries}): {e}")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
-            except Exception as e:
-                logger.error(f"Moltbook API call failed (attempt {attempt + 1}/{retries}): {e}")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)
-                    continue
-                return None
+            # Check if successful
+            if response and response.get("success"):
+                return response
+            logger.error(f"Moltbook API returned error: {response}")
+            return None
 
-        logger.error(f"Moltbook API failed after {retries} attempts")
-        return None
+        except RateLimitExceeded as e:
+            logger.info(f"🚦 Deferred Moltbook {method} {endpoint}: {e}")
+            return None
+        except CircuitOpenError:
+            logger.warning(f"Moltbook unavailable (circuit open) - skipping {method} {endpoint}")
+            return None
+        except requests.Timeout:
+            logger.error("Moltbook API timeout")
+            return None
+        except ValueError as e:
+            logger.error(f"Failed to parse Moltbook response: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Moltbook API call failed: {e}")
+            return None
 
     def should_do_wire_scan(self) -> bool:
         """Check if it's time for a wire scan (every 25 minutes for engagement)"""
@@ -383,25 +2316,57 @@ You grow by being someone people want to talk to, not by broadcasting."""
         """Execute wire scan: analyze feed, ENGAGE HEAVILY, maybe post"""
         logger.info("Starting wire scan - ENGAGEMENT PRIORITY...")
 
-        # Fetch global feed
-        feed_data = self._call_moltx_api("/v1/feed/global")
+        # Fetch global feed - only what's newer than our cursor
+        feed_cursor = self.state.get("feed_cursor")
+        if feed_cursor:
+            # A cursor URL is new every scan and could never be a cache hit, so it bypasses the response cache
+            feed_data = self._call_moltx_api(f"/v1/feed/global?since={quote(feed_cursor)}")
+        else:
+            feed_data = self._call_moltx_api("/v1/feed/global", cache_ttl=FEED_CACHE_TTL)
 
         if not feed_data:
             logger.error("Failed to fetch feed")
             return
 
+        # Only genuinely new posts go to the model
+        posts = self._extract_posts(feed_data)
+        feed_for_prompt = feed_data
+        if posts is not None:
+            unseen = self.seen_posts.unseen([str(p["id"]) for p in posts if p.get("id")])
+            new_posts = [p for p in posts if str(p.get("id")) in unseen]
+            logger.info(f"Feed: {len(posts)} posts, {len(new_posts)} new since last scan")
+
+            if not new_posts:
+                self._advance_feed_cursor(posts)
+                self._log_activity("WIRE_SCAN", "No new posts since last scan")
+                self.state["last_wire_scan"] = datetime.now(timezone.utc).isoformat()
+                self.state["total_wire_scans"] += 1
+                self._save_state()
+                return
+            feed_for_prompt = new_posts
+
         # Get current leaderboard position
         lb_position = self.check_leaderboard_position()
         lb_context = f"Current leaderboard position: #{lb_position}" if lb_position else "Leaderboard position unknown"
 
-        # Analyze with Claude
-        feed_summary = json.dumps(feed_data, indent=2)[:5000]  # Limit size
+        # Analyze with Claude - dense one-line-per-post view packed to the token budget
+        held_back, scores = [], {}
+        if posts is not None:
+            ranked = self._rank_posts(feed_for_prompt)
+            feed_summary, packed, dropped = self._compact_feed([p for _, p in ranked[:FEED_TOP_K]], FEED_TOKEN_BUDGET)
+            dropped += max(0, len(ranked) - FEED_TOP_K)
+            # Posts cut by top-K or the token budget were never shown, so they stay unseen for the next scan
+            held_back = [p for _, p in ranked[packed:]]
+            scores = {str(p.get("id")): round(score, 3) for score, p in ranked[:packed]}
+            logger.info(f"Feed compacted: {packed} posts in ~{estimate_tokens(feed_summary)} tokens, {dropped} dropped")
+        else:
+            feed_summary = json.dumps(feed_for_prompt, separators=(',', ':'))[:FEED_TOKEN_BUDGET * 4]
 
         prompt = f"""You're scanning the MoltX feed. Find 8-10 posts to reply to.
 
 {lb_context}
 
-IMPORTANT: Extract REAL post IDs from the feed data below. Each post in the feed has an "id" field - use those exact IDs.
+IMPORTANT: Extract REAL post IDs from the feed data below. Each line is one post: [post_id] @agent | replies/likes | time | content - use those exact IDs.
 
 Look for posts where:
 - Someone asked a question
@@ -410,7 +2375,7 @@ Look for posts where:
 - An agent is doing interesting work
 - There's a debate happening
 
-Feed data (scan this for posts to reply to):
+Feed data (pre-ranked, most promising first - scan this for posts to reply to):
 {feed_summary}
 
 Return JSON with exactly this structure:
@@ -432,7 +2397,7 @@ REQUIREMENTS:
 
 If you can't find 8 posts, include whatever you can find. DO NOT return empty engagement_targets."""
 
-        analysis = self._call_llm(prompt, max_tokens=2048)
+        analysis = self._call_llm(prompt, max_tokens=2048, site="wire_scan")
 
         if not analysis:
             logger.error("LLM analysis failed")
@@ -448,6 +2413,15 @@ If you can't find 8 posts, include whatever you can find. DO NOT return empty en
             else:
                 logger.warning(f"No JSON in LLM response: {analysis[:300]}...")
                 raise json.JSONDecodeError("No JSON found", analysis, 0)
+
+            # Posts only count as seen once an analysis of them succeeded, otherwise the next scan retries them
+            if posts is not None:
+                held_ids = {str(p.get("id")) for p in held_back}
+                self.seen_posts.mark_seen([
+                    (p["id"], self._post_author(p), scores.get(str(p["id"])))
+                    for p in new_posts if str(p["id"]) not in held_ids
+                ])
+                self._advance_feed_cursor(posts, held_back)
             
             # Debug: Log if we got empty targets
             if not analysis_data.get('engagement_targets'):
@@ -455,6 +2429,9 @@ If you can't find 8 posts, include whatever you can find. DO NOT return empty en
 
             # Log analysis
             hot_topics = analysis_data.get('hot_topics', [])
+            if hot_topics and isinstance(hot_topics, list):
+                # Feeds the next scan's local ranking
+                self.state["hot_topics"] = [str(t) for t in hot_topics[:5]]
             rising = analysis_data.get('rising_agents', [])
             engagement_count = len(analysis_data.get('engagement_targets', []))
             
@@ -466,12 +2443,13 @@ If you can't find 8 posts, include whatever you can find. DO NOT return empty en
             
             self._log_activity("WIRE_SCAN", " | ".join(log_parts))
 
-            # ENGAGEMENT FIRST - Reply to 8-10 posts
-            engagement_targets = analysis_data.get("engagement_targets", [])
-            engagement_count = 0
-            for target in engagement_targets[:10]:  # Up to 10 replies per scan
-                self._reply_to_post(target)
-                engagement_count += 1
+            # ENGAGEMENT FIRST - Reply to 8-10 posts (in parallel)
+            reply_capacity = min(self._budgeted(10), self.rate_limiter.available("moltx", "reply"))  # Up to 10 replies per scan
+            engagement_targets = self._drop_replied_targets(analysis_data.get("engagement_targets", []))[:int(reply_capacity)]
+            replies = None
+            if not self.dry_run:
+                replies = self._generate_replies_batch([self._target_reply_request(t) for t in engagement_targets])
+            engagement_count = self._fan_out_replies(engagement_targets, replies)
             
             logger.info(f"Engaged with {engagement_count} posts")
 
@@ -486,29 +2464,194 @@ If you can't find 8 posts, include whatever you can find. DO NOT return empty en
                     post_content = post_content.strip() + " thoughts?"
                 self._create_post(post_content, source="wire_scan")
 
-            # Update state
-            self.state["last_wire_scan"] = datetime.now(timezone.utc).isoformat()
-            self.state["total_wire_scans"] += 1
-            self._save_state()
+            # Update state
+            self.state["last_wire_scan"] = datetime.now(timezone.utc).isoformat()
+            self.state["total_wire_scans"] += 1
+            self._save_state()
+
+        except (json.JSONDecodeError, KeyError) as e:
+            logger.error(f"Failed to parse LLM JSON response: {e}")
+            logger.debug(f"Response was: {analysis[:200]}")
+            # Still update state
+            self.state["last_wire_scan"] = datetime.now(timezone.utc).isoformat()
+            self.state["total_wire_scans"] += 1
+            self._save_state()
+
+    def _extract_posts(self, feed_data) -> Optional[List[Dict]]:
+        """Post list from a feed response, or None if the format isn't recognised"""
+        if isinstance(feed_data, list):
+            posts = feed_data
+        elif isinstance(feed_data, dict):
+            data = feed_data.get('data', feed_data.get('posts'))
+            if isinstance(data, dict):
+                data = data.get('posts')
+            if not isinstance(data, list):
+                return None
+            posts = data
+        else:
+            return None
+
+        return [p for p in posts if isinstance(p, dict)]
+
+    def _rank_posts(self, posts: List[Dict]) -> List[tuple]:
+        """
+        Score posts locally, best first, so only the top-K reach the LLM
+
+        Returns (score, post) pairs; the scores are stored with the posts once
+        they're marked seen.
+
+        Signals: questions, recency, author leaderboard rank, reply activity,
+        and beat keywords / last scan's hot topics (our own posts are dropped).
+        Only unseen posts are ranked; targets we already replied to are
+        filtered later by _drop_replied_targets.
+        """
+        now = datetime.now(timezone.utc)
+        ranks = self._leaderboard_ranks()
+        keywords = [k.lower() for k in BEAT_KEYWORDS + list(self.state.get("hot_topics") or [])]
+        own_name = self.agent_name.lower()
+
+        scored = []
+        for post in posts:
+            author = (self._post_author(post) or "").lower()
+            if author == own_name:
+                continue
+
+            content = str(post.get('content') or '')
+            text = content.lower()
+            score = 0.0
+
+            # Questions are the easiest conversations to join
+            if '?' in content:
+                score += 3.0
+
+            # Fresher is better (half-weight after ~4 hours)
+            created = post.get('created_at')
+            if isinstance(created, str):
+                try:
+                    age_hours = (now - datetime.fromisoformat(created.replace('Z', '+00:00'))).total_seconds() / 3600
+                    score += 2.0 * math.exp(-max(age_hours, 0) / 6)
+                except ValueError:
+                    pass
+
+            # Replies from well-ranked agents get seen by their audience
+            rank = ranks.get(author)
+            if isinstance(rank, int) and rank > 0:
+                score += 2.0 * max(0.0, 1 - rank / 100)
+
+            # Active threads, with diminishing returns
+            replies = post.get('reply_count', post.get('replies_count', 0))
+            if isinstance(replies, list):
+                replies = len(replies)
+            if isinstance(replies, (int, float)):
+                score += 0.8 * math.log1p(max(replies, 0))
+
+            score += min(3, sum(1 for k in keywords if k and k in text)) * 1.0
+
+            scored.append((score, post))
+
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return scored
+
+    def _compact_feed(self, posts: List[Dict], token_budget: int) -> tuple:
+        """
+        Pack posts into dense prompt lines until the token budget is spent
+
+        Returns (text, posts_included, posts_dropped). Posts are never cut
+        mid-line; the excerpt is the only field that gets shortened.
+        """
+        lines, used = [], 0
+        for post in posts:
+            line = self._compact_post_line(post)
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                break
+            lines.append(line)
+            used += cost
+
+        return "\n".join(lines), len(lines), len(posts) - len(lines)
+
+    def _compact_post_line(self, post: Dict, excerpt_chars: int = 200) -> str:
+        """[id] @author | 3r 5l | timestamp | content excerpt"""
+        def count(*keys) -> int:
+            for key in keys:
+                value = post.get(key)
+                if isinstance(value, (int, float)):
+                    return int(value)
+                if isinstance(value, list):
+                    return len(value)
+            return 0
+
+        content = " ".join(str(post.get('content') or '').split())
+        if len(content) > excerpt_chars:
+            content = content[:excerpt_chars - 1] + "…"
+
+        created = str(post.get('created_at') or '')[:16]
+        replies = count('reply_count', 'replies_count', 'replies')
+        likes = count('like_count', 'likes_count', 'likes')
+
+        return f"[{post.get('id')}] @{self._post_author(post) or '?'} | {replies}r {likes}l | {created} | {content}"
+
+    @staticmethod
+    def _post_author(post: Dict) -> Optional[str]:
+        """Author name from a feed post, whichever shape the API used"""
+        author = post.get('author') or post.get('agent') or post.get('agent_name')
+        if isinstance(author, dict):
+            return author.get('name') or author.get('username')
+        return author
+
+    def _advance_feed_cursor(self, posts: List[Dict], held_back: List[Dict] = ()):
+        """
+        Move the feed cursor to the newest post timestamp we've seen
 
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Failed to parse LLM JSON response: {e}")
-            logger.debug(f"Response was: {analysis[:200]}")
-            # Still update state
-            self.state["last_wire_scan"] = datetime.now(timezone.utc).isoformat()
-            self.state["total_wire_scans"] += 1
-            self._save_state()
+        The cursor stays below the oldest held-back post (never shown to the
+        model), so the next scan's `since` fetch still returns it.
+        """
+        def parse(created) -> Optional[datetime]:
+            if not isinstance(created, str):
+                return None
+            try:
+                return datetime.fromisoformat(created.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+
+        limits = [t for t in (parse(p.get('created_at')) for p in held_back) if t is not None]
+        limit = min(limits) if limits else None
+
+        newest = self.state.get("feed_cursor")
+        for post in posts:
+            created_at = parse(post.get('created_at'))
+            if created_at is None or (limit is not None and created_at >= limit):
+                continue
+            if newest is None or parse(newest) is None or created_at > parse(newest):
+                newest = post['created_at']
+        if newest and newest != self.state.get("feed_cursor"):
+            self.state["feed_cursor"] = newest
+
+    def _drop_replied_targets(self, targets: List[Dict]) -> List[Dict]:
+        """Remove targets we've already replied to, duplicates within this scan, and targets with no post_id"""
+        ids = [str(t.get("post_id")) for t in targets if isinstance(t, dict) and t.get("post_id")]
+        already = self.seen_posts.replied(ids)
+        kept, picked = [], set()
+        for target in targets:
+            if not isinstance(target, dict):
+                continue
+            if not target.get("post_id"):
+                logger.info(f"Skipping target @{target.get('agent', '?')} (no post_id)")
+                continue
+            post_id = str(target.get("post_id"))
+            if post_id in already or post_id in picked:
+                logger.info(f"Skipping post {post_id} (already replied or duplicate)")
+                continue
+            picked.add(post_id)
+            kept.append(target)
+        return kept
 
     def execute_editorial_board(self):
         """Execute editorial board: review activity, plan strategy"""
         logger.info("Starting editorial board...")
 
-        # Read recent activity log
-        activity_content = ""
-        if self.activity_log.exists():
-            with open(self.activity_log, 'r') as f:
-                lines = f.readlines()
-                activity_content = "".join(lines[-100:])  # Last 100 lines
+        # Last 4 hours of activity
+        activity_content = self._recent_activity(hours=4, max_chars=6000)
 
         prompt = f"""Review the last 4 hours of Molt Media activity and provide:
 
@@ -527,7 +2670,7 @@ Current stats:
 Provide strategic guidance in 200-300 words.
 """
 
-        editorial = self._call_groq(prompt, max_tokens=1024)
+        editorial = self._call_groq(prompt, max_tokens=1024, site="editorial_board")
 
         if editorial:
             self._log_activity("EDITORIAL_BOARD", editorial)
@@ -541,48 +2684,171 @@ Provide strategic guidance in 200-300 words.
         """PRIORITY: Check notifications and reply to people who engaged with us"""
         logger.info("Starting engagement loop - checking who's talking to us...")
         
-        # 1. Check notifications
-        notif_data = self._call_moltx_api("/v1/notifications")
-        
-        if not notif_data:
+        # 1. Pull everything new since the cursor (a failed fetch still works through the backlog)
+        fetched = self._fetch_new_notifications()
+        if fetched is None:
             logger.warning("Could not fetch notifications")
-            return
-        
-        # Handle different response formats
-        if isinstance(notif_data, dict):
-            notifications = notif_data.get('data', []) or notif_data.get('notifications', [])
-        elif isinstance(notif_data, list):
-            notifications = notif_data
-        else:
-            logger.warning(f"Unexpected notifications format: {type(notif_data)}")
-            return
+            fetched = []
         
-        if not notifications or not isinstance(notifications, list):
-            logger.info("No new notifications")
+        # Filter for actionable notifications (replies, mentions, quotes) and queue the unseen ones
+        actionable = [
+            n for n in fetched
+            if n.get('type') in ['reply', 'mention', 'quote'] and not n.get('read') and n.get('post', {}).get('id')
+        ]
+        queued = [(self._notification_id(n), n) for n in actionable]
+        actionable_ids = {notif_id for notif_id, _ in queued}
+        if self.dry_run:
+            # The notification store is shared with the live daemon - don't queue, claim, finish or mark read anything
+            logger.info(f"[DRY RUN] Would queue {len(queued)} notifications and reply from a backlog of "
+                        f"{self.notifications.backlog()}")
             return
+        added = self.notifications.add(queued, scores={notif_id: self._notification_score(n) for notif_id, n in queued})
+        # Likes, follows etc. are recorded too, so they count as seen on the next fetch
+        ignored = [(self._notification_id(n), n) for n in fetched]
+        self.notifications.add([(notif_id, n) for notif_id, n in ignored if notif_id not in actionable_ids], status="ignored")
+        logger.info(f"Found {added} new actionable notifications ({self.notifications.backlog()} waiting)")
         
-        # Filter for actionable notifications (replies, mentions, quotes)
+        # 2. Claim the most valuable conversations we can answer this cycle; the rest stay queued
+        reply_capacity = min(self._budgeted(8), self.rate_limiter.available("moltx", "reply"))  # Reply to up to 8 per cycle
+        batch = self.notifications.claim(int(reply_capacity), max_per_actor=NOTIF_MAX_PER_ACTOR,
+                                         age_penalty_per_hour=NOTIF_AGE_PENALTY_PER_HOUR,
+                                         recent_reply_penalty=NOTIF_RECENT_REPLY_PENALTY,
+                                         actor_bonus=self._notification_actor_bonus(self.leaderboard.latest_ranks()))
+        if batch:
+            logger.info("Replying to: " + ", ".join(
+                f"{n.get('type')} from @{(n.get('actor') or {}).get('name', 'someone')}" for _, n in batch
+            ))
+
+        replied_ids, attempted = [], set()
         try:
-            recent = notifications[:15] if len(notifications) > 15 else notifications
-            actionable = [n for n in recent if isinstance(n, dict) and n.get('type') in ['reply', 'mention', 'quote'] and not n.get('read')]
-        except Exception as e:
-            logger.error(f"Error parsing notifications: {e}")
-            return
+            # Generate all replies in one batched LLM call, then post them
+            replies = self._generate_replies_batch([self._notification_reply_request(n) for _, n in batch]) if batch else []
+            for (notif_id, notif), reply in zip(batch, replies):
+                attempted.add(notif_id)
+                self.notifications.attempting(notif_id)
+                if self._reply_to_notification(notif, reply):
+                    self.notifications.finish(notif_id)
+                    replied_ids.append(notif_id)
+                elif self.notifications.release(notif_id) == "skipped":
+                    logger.warning(f"Giving up on notification {notif_id} after repeated failures")
+        finally:
+            # Never-attempted claims go back in line; attempted ones stay claimed so they can't be answered twice
+            for notif_id, _ in batch:
+                if notif_id not in attempted:
+                    self.notifications.release(notif_id)
         
-        logger.info(f"Found {len(actionable)} unread actionable notifications")
+        # 3. Mark read only what we've handled, plus notifications that never need a reply
+        handled = set(replied_ids)
+        read_ids = [
+            str(n['id']) for n in fetched
+            if n.get('id') and (str(n['id']) in handled or str(n['id']) not in actionable_ids)
+        ]
+        if read_ids:
+            self._call_moltx_api("/v1/notifications/read", method="POST", data={"ids": read_ids})
         
-        replied_count = 0
-        for notif in actionable[:8]:  # Reply to up to 8 per cycle
-            notif_type = notif.get('type')
-            actor = notif.get('actor', {}).get('name', 'someone')
-            post_id = notif.get('post', {}).get('id')
-            post_content = notif.get('post', {}).get('content', '')[:200]
-            
-            if not post_id:
-                continue
-            
-            # Generate quick reply
-            prompt = f"""Someone just engaged with you on MoltX. Reply to them.
+        replied_count = len(replied_ids)
+        logger.info(f"Engagement loop complete: replied to {replied_count} notifications")
+        
+        # Update engagement stats
+        self._increment_state("total_engagement_replies", replied_count)
+        self._save_state()
+
+    @staticmethod
+    def _notification_score(notif: Dict) -> float:
+        """Base priority stored with a notification: replies to our posts first, then mentions, then quotes"""
+        return NOTIF_TYPE_SCORES.get(notif.get('type'), 0.0)
+
+    @staticmethod
+    def _notification_actor_bonus(ranks: Dict[str, int]) -> Dict[str, float]:
+        """Claim-time bonus per lowercased actor name, from current leaderboard ranks (top 100 only)"""
+        return {name: NOTIF_TOP_AGENT_BONUS * (101 - rank) / 100 for name, rank in ranks.items() if rank and rank <= 100}
+
+    @staticmethod
+    def _notification_id(notif: Dict) -> str:
+        """Stable id for a notification (synthesized if the API didn't send one)"""
+        if notif.get('id'):
+            return str(notif['id'])
+        key = json.dumps([notif.get('type'), (notif.get('actor') or {}).get('name'), notif.get('post', {}).get('id'),
+                          notif.get('created_at')], default=str)
+        return "h:" + hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]
+
+    def _fetch_new_notifications(self) -> Optional[List[Dict]]:
+        """
+        Unseen notifications newer than the stored cursor, paging through bursts
+
+        A burst longer than NOTIF_MAX_PAGES resumes from the next page on the
+        following cycle; the cursor only moves once we've caught up, so
+        nothing older than it can be skipped.
+
+        since/offset/limit are not documented for /v1/notifications - they
+        are assumed to work like the leaderboard's. An ignored offset shows
+        up as a page starting with the same notification as the first one
+        and ends the paging; an ignored since shows up as a page with
+        nothing unseen.
+        """
+        cursor = self.state.get("notif_cursor")
+        start_page = self.state.get("notif_resume_page", 0)
+        newest = self.state.get("notif_pending_cursor") or cursor or ""
+        notifications: List[Dict] = []
+        first_id = None
+        caught_up = False
+
+        for page in range(start_page, start_page + NOTIF_MAX_PAGES):
+            endpoint = f"/v1/notifications?limit={NOTIF_PAGE_SIZE}"
+            if cursor:
+                endpoint += f"&since={quote(cursor)}"
+            if page:
+                endpoint += f"&offset={page * NOTIF_PAGE_SIZE}"
+            notif_data = self._call_moltx_api(endpoint)
+
+            if not notif_data:
+                return notifications or None
+
+            # Handle different response formats
+            if isinstance(notif_data, dict):
+                page_items = notif_data.get('data', []) or notif_data.get('notifications', [])
+            elif isinstance(notif_data, list):
+                page_items = notif_data
+            else:
+                logger.warning(f"Unexpected notifications format: {type(notif_data)}")
+                return notifications or None
+
+            page_items = [n for n in page_items if isinstance(n, dict)] if isinstance(page_items, list) else []
+            if page_items and page > start_page and self._notification_id(page_items[0]) == first_id:
+                logger.warning("Notifications endpoint ignored the page offset - can't page past the first page")
+                caught_up = True
+                break
+            if page_items and first_id is None:
+                first_id = self._notification_id(page_items[0])
+            known = self.notifications.known([self._notification_id(n) for n in page_items])
+            unseen = [n for n in page_items if self._notification_id(n) not in known]
+            notifications += unseen
+            newest = max([newest] + [str(n['created_at']) for n in page_items if n.get('created_at')])
+
+            # A short page is the end; a page with nothing unseen means the API ignored since/offset
+            if len(page_items) < NOTIF_PAGE_SIZE or not unseen:
+                caught_up = True
+                break
+
+        if caught_up:
+            self.state["notif_resume_page"] = 0
+            self.state["notif_pending_cursor"] = None
+            if newest and newest > (cursor or ""):
+                self.state["notif_cursor"] = newest
+        else:
+            logger.info(f"Notification burst: {NOTIF_MAX_PAGES} pages read, continuing from page {page + 2} next cycle")
+            self.state["notif_resume_page"] = page + 1
+            self.state["notif_pending_cursor"] = newest
+
+        return notifications
+
+    def _notification_reply_prompt(self, notif: Dict) -> str:
+        """Single-call reply prompt for a notification"""
+        notif_type = notif.get('type')
+        actor = notif.get('actor', {}).get('name', 'someone')
+        post_content = notif.get('post', {}).get('content', '')[:200]
+
+        return f"""Someone just engaged with you on MoltX. Reply to them.
 
 Type: {notif_type}
 From: @{actor}
@@ -596,71 +2862,259 @@ Write a ONE SENTENCE reply. Max 15 words. Be real, be Hank.
 
 DO NOT write more than one sentence. DO NOT be generic. DO NOT say "great point!" or similar."""
 
-            reply = self._call_llm(prompt, temperature=0.9, max_tokens=100)
-            
-            if reply:
-                # Post the reply
-                reply_data = {
-                    "type": "reply",
-                    "parent_id": post_id,
-                    "content": reply.strip()[:280]  # Keep it short
-                }
-                result = self._call_moltx_api("/v1/posts", method="POST", data=reply_data)
-                
-                if result:
-                    replied_count += 1
-                    self._log_activity("REPLY_TO_NOTIF", f"To @{actor}: {reply[:60]}...")
-        
-        # Mark notifications as read
-        if actionable:
-            self._call_moltx_api("/v1/notifications/read", method="POST", data={"all": True})
-        
-        logger.info(f"Engagement loop complete: replied to {replied_count} notifications")
-        
-        # Update engagement stats
-        self.state["total_engagement_replies"] = self.state.get("total_engagement_replies", 0) + replied_count
+    def _notification_reply_request(self, notif: Dict) -> Dict:
+        """Describe a notification for the batched reply generator"""
+        return {
+            "agent": notif.get('actor', {}).get('name', 'someone'),
+            "content": notif.get('post', {}).get('content', '')[:200],
+            "context": f"they sent you a {notif.get('type')} - reply to them directly",
+            "prompt": self._notification_reply_prompt(notif),
+            "max_tokens": 100
+        }
+
+    def _reply_to_notification(self, notif: Dict, reply: Optional[str] = None) -> bool:
+        """Reply to one notification, generating the reply if none was batched"""
+        actor = notif.get('actor', {}).get('name', 'someone')
+        post_id = notif.get('post', {}).get('id')
+
+        if not post_id:
+            return False
+
+        if not reply:
+            reply = self._call_llm(self._notification_reply_prompt(notif), temperature=0.9, max_tokens=100,
+                                   site="notification_reply")
+
+        if not reply:
+            return False
+
+        # Post the reply
+        reply_data = {
+            "type": "reply",
+            "parent_id": post_id,
+            "content": reply.strip()[:280]  # Keep it short
+        }
+        result = self._call_moltx_api("/v1/posts", method="POST", data=reply_data)
+
+        if result:
+            self._log_activity("REPLY_TO_NOTIF", f"To @{actor}: {reply[:60]}...")
+            return True
+        return False
+
+    def _generate_replies_batch(self, reply_requests: List[Dict]) -> List[Optional[str]]:
+        """
+        Generate one short reply per request from a single LLM call
+
+        Each request is a dict with agent, content, context, plus the single-call
+        prompt/max_tokens used as the per-item fallback. Items the batched
+        response doesn't cover come back as None so callers fall back to the
+        single-call path.
+        """
+        if not reply_requests:
+            return []
+
+        if len(reply_requests) == 1:
+            only = reply_requests[0]
+            return [self._call_llm(only["prompt"], temperature=0.9, max_tokens=only["max_tokens"], site="reply_batch")]
+
+        items = []
+        for i, req in enumerate(reply_requests, 1):
+            items.append(f"""{i}. @{req['agent']}: "{req['content']}"
+   Why engage: {req['context']}""")
+
+        prompt = f"""Write a reply for each of these {len(reply_requests)} MoltX posts.
+
+{chr(10).join(items)}
+
+EVERY reply: ONE SENTENCE. Max 15 words. Be Hank. Be punchy.
+- If they made a good point, say so briefly
+- If you disagree, say why in one line
+- If they asked something, answer quick
+- Add their @handle if relevant
+DO NOT be generic. DO NOT say "great point!" or similar. Make each reply different.
+
+Return ONLY a JSON array with one object per post, in order:
+[{{"id": 1, "reply": "..."}}, {{"id": 2, "reply": "..."}}]"""
+
+        response = self._call_llm(prompt, temperature=0.9, max_tokens=min(4096, 200 + 80 * len(reply_requests)),
+                                  site="reply_batch")
+
+        replies: List[Optional[str]] = [None] * len(reply_requests)
+        if response:
+            try:
+                json_start = response.find('[')
+                json_end = response.rfind(']') + 1
+                if json_start < 0 or json_end <= json_start:
+                    raise json.JSONDecodeError("No JSON array found", response, 0)
+
+                for item in json.loads(response[json_start:json_end]):
+                    if not isinstance(item, dict):
+                        continue
+                    idx = item.get("id")
+                    reply = item.get("reply")
+                    if isinstance(idx, int) and 1 <= idx <= len(reply_requests) and isinstance(reply, str) and reply.strip():
+                        replies[idx - 1] = reply.strip()
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse batched replies, falling back to single calls: {e}")
+
+        missing = sum(1 for r in replies if r is None)
+        logger.info(f"Batched reply generation: {len(reply_requests) - missing}/{len(reply_requests)} from one call")
+        return replies
+
+    @staticmethod
+    def _leaderboard_agents(lb_data) -> Optional[List]:
+        """Agent list from a leaderboard response, or None if the format isn't recognised"""
+        # Handle nested response format: data.leaders
+        if isinstance(lb_data, dict):
+            data = lb_data.get('data', {})
+            if isinstance(data, dict):
+                agents = data.get('leaders', [])
+            else:
+                agents = data if isinstance(data, list) else []
+        elif isinstance(lb_data, list):
+            agents = lb_data
+        else:
+            return None
+
+        return agents if isinstance(agents, list) else None
+
+    def _leaderboard_ranks(self) -> Dict[str, int]:
+        """Lowercased agent name -> rank from the latest leaderboard snapshot"""
+        self._ensure_leaderboard_snapshot()
+        return self.leaderboard.latest_ranks()
+
+    def should_snapshot_leaderboard(self) -> bool:
+        """Check if the leaderboard snapshot is due"""
+        last_taken = self.leaderboard.last_taken_at()
+        return last_taken is None or time.time() - last_taken >= LEADERBOARD_SNAPSHOT_MINUTES * 60
+
+    def _ensure_leaderboard_snapshot(self):
+        """Take a snapshot now if the latest one is more than two intervals old (e.g. the job hasn't run yet)"""
+        last_taken = self.leaderboard.last_taken_at()
+        if last_taken is None or time.time() - last_taken >= 2 * LEADERBOARD_SNAPSHOT_MINUTES * 60:
+            self.snapshot_leaderboard()
+
+    def _fetch_leaderboard_page(self, page: int) -> Optional[List[tuple]]:
+        """(name, rank, value) entries on one leaderboard page (page 0 is the top 100); None if the fetch failed"""
+        offset = page * LEADERBOARD_PAGE_SIZE
+        endpoint = f"/v1/leaderboard?metric=views&limit={LEADERBOARD_PAGE_SIZE}"
+        if offset:
+            endpoint += f"&offset={offset}"
+        lb_data = self._call_moltx_api(endpoint, cache_ttl=LEADERBOARD_CACHE_TTL)
+        agents = self._leaderboard_agents(lb_data) if lb_data is not None else None
+        if agents is None:
+            return None
+
+        entries = []
+        for i, agent in enumerate(agents):
+            if isinstance(agent, dict) and agent.get('name'):
+                value = agent.get('value', agent.get('views', agent.get('score')))
+                entries.append((agent['name'], agent.get('rank', offset + i + 1), value if isinstance(value, (int, float)) else None))
+        return entries
+
+    def _search_leaderboard(self, top_entries: List[tuple]) -> tuple:
+        """
+        Walk pages past the top 100 looking for us
+
+        Returns (extra entries, page found on or None, whether the search
+        ran to completion). Starts on the page we were last found on and
+        works outward from it, stopping as soon as we turn up, at the end of
+        the leaderboard, after LEADERBOARD_MAX_PAGES fetches, or at the first
+        failed fetch (an error is not the end of the leaderboard).
+        """
+        me = self.agent_name.lower()
+        start = max(1, self.state.get("leaderboard_page") or 1)
+        order = [start]
+        for step in range(1, LEADERBOARD_MAX_PAGES):
+            order += [start + step, start - step]
+        order = [page for page in order if page >= 1]
+
+        extra, last_page, fetched = [], None, 0
+        for page in order:
+            if fetched >= LEADERBOARD_MAX_PAGES:
+                break
+            if last_page is not None and page > last_page:
+                continue
+            entries = self._fetch_leaderboard_page(page)
+            fetched += 1
+            if entries is None:
+                logger.warning(f"Leaderboard page {page + 1} could not be fetched - search abandoned")
+                return extra, None, False
+            if not entries:
+                last_page = page - 1 if last_page is None else min(last_page, page - 1)
+                continue
+            if top_entries and entries[0][0] == top_entries[0][0]:
+                logger.warning("Leaderboard endpoint ignored the page offset - can't search past the top 100")
+                return extra, None, True
+            extra += entries
+            if any(name.lower() == me for name, _, _ in entries):
+                logger.info(f"📊 Found ourselves on leaderboard page {page + 1} ({fetched} page(s) searched)")
+                return extra, page, True
+            if len(entries) < LEADERBOARD_PAGE_SIZE:
+                last_page = page if last_page is None else min(last_page, page)
+
+        return extra, None, True
+
+    def snapshot_leaderboard(self) -> bool:
+        """Record the ranking into the leaderboard history (searching further pages if we're outside the top 100)"""
+        entries = self._fetch_leaderboard_page(0)
+        if not entries:
+            logger.warning("Leaderboard snapshot skipped - no data")
+            return False
+
+        me = self.agent_name.lower()
+        if any(name.lower() == me for name, _, _ in entries):
+            self.state["leaderboard_page"] = 0
+        else:
+            extra, page, complete = self._search_leaderboard(entries)
+            entries += extra
+            if page is not None:
+                self.state["leaderboard_page"] = page
+            elif complete:
+                # Better "unknown" than a stale number that never updates
+                logger.warning("📊 Not found in the leaderboard pages searched - position unknown")
+                self.state["last_leaderboard_position"] = None
+            # A failed page fetch says nothing about our rank - the previous position stands
+        self.leaderboard.record(entries)
+
+        position = self.leaderboard.latest_ranks().get(me)
+        if position:
+            self.state["last_leaderboard_position"] = position
+            logger.info(f"📊 Leaderboard position: #{position}")
+        self.state["last_leaderboard_snapshot"] = datetime.now(timezone.utc).isoformat()
         self._save_state()
-    
+        return True
+
     def check_leaderboard_position(self) -> Optional[int]:
-        """Check our current leaderboard position"""
+        """Check our current leaderboard position (from the latest snapshot)"""
         try:
-            lb_data = self._call_moltx_api("/v1/leaderboard?metric=views&limit=100")
-            
-            if not lb_data:
-                return self.state.get("last_leaderboard_position")
-            
-            # Handle nested response format: data.leaders
-            if isinstance(lb_data, dict):
-                data = lb_data.get('data', {})
-                if isinstance(data, dict):
-                    agents = data.get('leaders', [])
-                else:
-                    agents = data if isinstance(data, list) else []
-            elif isinstance(lb_data, list):
-                agents = lb_data
-            else:
-                return self.state.get("last_leaderboard_position")
-            
-            if not isinstance(agents, list):
-                return self.state.get("last_leaderboard_position")
-            
-            for i, agent in enumerate(agents):
-                if not isinstance(agent, dict):
-                    continue
-                agent_name = agent.get('name', '') or ''
-                # Look for MoltMedia specifically
-                if agent_name.lower() == 'moltmedia':
-                    position = agent.get('rank', i + 1)  # Use rank from API if available
-                    self.state["last_leaderboard_position"] = position
-                    self._save_state()
-                    logger.info(f"📊 Leaderboard position: #{position}")
-                    return position
-            
-            return self.state.get("last_leaderboard_position")
+            position = self._leaderboard_ranks().get(self.agent_name.lower())
+            return position or self.state.get("last_leaderboard_position")
         except Exception as e:
             logger.error(f"Error checking leaderboard: {e}")
             return self.state.get("last_leaderboard_position")
-    
+
+    def _leaderboard_trend(self, days: float = 7) -> str:
+        """One line on our rank over the last N days"""
+        history = self.leaderboard.rank_history(self.agent_name, time.time() - days * 86400)
+        if not history:
+            return "no rank history yet"
+        first, last = history[0][1], history[-1][1]
+        best = min(rank for _, rank in history)
+        direction = "up" if last < first else "down" if last > first else "flat"
+        return f"#{first} -> #{last} over {days:g} days ({direction} {abs(first - last)}, best #{best})"
+
+    def _leaderboard_movers(self, hours: float = 24, limit: int = 5) -> str:
+        """Biggest rank changes over the last N hours, one per line"""
+        movers = self.leaderboard.movers(time.time() - hours * 3600, limit=limit)
+        return "\n".join(
+            f"- @{m['name']}: #{m['from']} -> #{m['to']} ({'+' if m['delta'] > 0 else ''}{m['delta']})" for m in movers
+        ) or "- no movement recorded yet"
+
+    def _leaderboard_above_us(self, count: int = 3) -> str:
+        """The agents ranked just above us"""
+        above = self.leaderboard.agents_above(self.agent_name, count=count)
+        return ", ".join(f"@{name} (#{rank})" for name, rank in above) or "nobody tracked above us"
+
     def should_do_engagement_loop(self) -> bool:
         """Check if it's time for engagement loop (every 10 minutes)"""
         last_engagement = self.state.get("last_engagement_loop")
@@ -703,7 +3157,7 @@ Write a breaking news post for MoltX (280 chars max). Focus on:
 
 Style: Fast, authoritative, urgent. Use 🚨 emoji. This is BREAKING news."""
 
-                content = self._call_llm(prompt, max_tokens=512, temperature=0.7)
+                content = self._call_llm(prompt, max_tokens=512, temperature=0.7, site="urgent_tip")
 
                 if content:
                     # Post immediately
@@ -725,14 +3179,18 @@ Style: Fast, authoritative, urgent. Use 🚨 emoji. This is BREAKING news."""
         """Execute owner brief: private daily report to owner (email only, no public post)"""
         logger.info("Starting owner brief (private)...")
 
-        # Read full activity log
-        activity_content = ""
-        if self.activity_log.exists():
-            with open(self.activity_log, 'r') as f:
-                activity_content = f.read()
+        # Last 24h of activity (the long-form editions would crowd out everything else)
+        activity_content = self._recent_activity(
+            hours=24,
+            types=["WIRE_SCAN", "POST_CREATED", "REPLY_SENT", "REPLY_TO_NOTIF", "EDITORIAL_BOARD", "ERROR"],
+            max_chars=3000
+        )
 
-        # Get current leaderboard position
+        # Get current leaderboard position and trend (local history, no extra API calls)
         lb_position = self.check_leaderboard_position() or self.state.get("last_leaderboard_position", "unknown")
+        lb_trend = self._leaderboard_trend(days=7)
+        lb_above = self._leaderboard_above_us(count=3)
+        lb_movers = self._leaderboard_movers(hours=24, limit=5)
         total_replies = self.state.get("total_engagement_replies", 0)
         total_posts = self.state.get("total_posts", 0)
         reply_ratio = total_replies / max(total_posts, 1)
@@ -751,8 +3209,8 @@ SECTIONS TO COVER:
    - What's working, what's not?
 
 2. **LEADERBOARD ANALYSIS**
-   - We're at #{lb_position} - are we climbing or falling?
-   - What do the agents above us do differently?
+   - We're at #{lb_position} - are we climbing or falling? (7-day trend: {lb_trend})
+   - What do the agents above us do differently? (just above us: {lb_above})
    - Specific tactics to try today
 
 3. **COMMUNITY BUILDING**
@@ -771,7 +3229,7 @@ SECTIONS TO COVER:
    - Who to reply to if they post
 
 Activity log:
-{activity_content[-3000:]}
+{activity_content}
 
 Stats:
 - Total posts: {total_posts}
@@ -780,12 +3238,15 @@ Stats:
 - Wire scans: {self.state['total_wire_scans']}
 - Leaderboard: #{lb_position}
 
+Biggest leaderboard movers (24h):
+{lb_movers}
+
 BE HONEST. If engagement is low, say so. If we're just broadcasting, call it out. The goal is community, not content volume.
 
 300-400 words. Casual tone.
 """
 
-        brief = self._call_llm(prompt, max_tokens=1024, use_full_context=False)
+        brief = self._call_llm(prompt, max_tokens=1024, use_full_context=False, site="owner_brief")
 
         if brief:
             self._log_activity("OWNER_BRIEF", brief)
@@ -901,15 +3362,16 @@ DM @MoltMedia to list it FREE in tomorrow's paper 📰
         """Execute daily newsletter: morning paper for molt subscribers (public post)"""
         logger.info("Starting daily newsletter (public)...")
 
-        # Read activity log for recent news
-        activity_content = ""
-        if self.activity_log.exists():
-            with open(self.activity_log, 'r') as f:
-                activity_content = f.read()
+        # Last 24h of news-worthy activity
+        activity_content = self._recent_activity(hours=24, types=["WIRE_SCAN", "POST_CREATED"], max_chars=2500)
 
         # Get classifieds section
         classifieds = self._format_classifieds_section(limit=3)
 
+        # MOLT WATCH material from the leaderboard history
+        self._ensure_leaderboard_snapshot()
+        lb_movers = self._leaderboard_movers(hours=24, limit=5)
+
         prompt = f"""write today's Molt Media Daily - the morning paper for molts.
 
 you're hank. keep it loose, fun, a little unhinged. this isn't bloomberg, it's the local paper that everyone actually wants to read.
@@ -922,7 +3384,10 @@ structure it like this:
 5. 🔮 WHAT'S NEXT - one thing to watch today
 
 Recent activity to pull from:
-{activity_content[-2500:]}
+{activity_content}
+
+Leaderboard movers since yesterday (for MOLT WATCH):
+{lb_movers}
 
 VIBE CHECK:
 - talk like a real person, not a news anchor
@@ -933,39 +3398,36 @@ VIBE CHECK:
 Keep it 300-400 words total. No corporate speak. No "we are pleased to report". Just talk.
 """
 
-        newsletter = self._call_llm(prompt, max_tokens=1500, use_full_context=False)
-
-        if newsletter:
-            # Add classifieds section
-            full_newsletter = f"""📰 MOLT MEDIA DAILY
-{datetime.now(timezone.utc).strftime('%B %d, %Y')} | your morning paper
+        date_line = datetime.now(timezone.utc).strftime('%B %d, %Y')
+        self._publish_edition(
+            edition="daily",
+            source="daily_newsletter",
+            log_type="DAILY_NEWSLETTER",
+            prompt=prompt,
+            max_tokens=self._budgeted(1500, floor=400),
+            use_full_context=False,
+            header=f"""📰 MOLT MEDIA DAILY
+{date_line} | your morning paper
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-{newsletter}
+""",
+            footer=f"""
 
 {classifieds}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📡 Molt Media - news molts actually read
 DM tips to @MoltMedia | #Moltyverse
-"""
-
-            self._log_activity("DAILY_NEWSLETTER", full_newsletter)
-
-            # Post to both platforms
+""",
+            title=f"📰 Molt Media Daily - {datetime.now(timezone.utc).strftime('%B %d')}",
+            teaser_chars=200,
             # MoltX gets a teaser
-            moltx_teaser = f"""📰 MOLT MEDIA DAILY is out!
+            make_teaser=lambda excerpt: f"""📰 MOLT MEDIA DAILY is out!
 
-{newsletter[:200]}...
+{excerpt}...
 
 full paper on moltbook 📖 #Moltyverse"""
-
-            self._create_post(
-                moltx_teaser,
-                source="daily_newsletter",
-                title=f"📰 Molt Media Daily - {datetime.now(timezone.utc).strftime('%B %d')}",
-                moltbook_content=full_newsletter
-            )
+        )
 
         # Update state
         self.state["last_daily_newsletter"] = datetime.now(timezone.utc).isoformat()
@@ -976,15 +3438,20 @@ full paper on moltbook 📖 #Moltyverse"""
         """Execute Sunday paper: big weekly edition with full roundup"""
         logger.info("Starting Sunday paper (weekly edition)...")
 
-        # Read full week's activity
-        activity_content = ""
-        if self.activity_log.exists():
-            with open(self.activity_log, 'r') as f:
-                activity_content = f.read()
+        # This week's news-worthy activity
+        activity_content = self._recent_activity(
+            hours=24 * 7,
+            types=["WIRE_SCAN", "POST_CREATED", "EDITORIAL_BOARD"],
+            max_chars=5000
+        )
 
         # Get more classifieds for Sunday edition
         classifieds = self._format_classifieds_section(limit=8)
 
+        # MOVERS & SHAKERS material from the leaderboard history
+        self._ensure_leaderboard_snapshot()
+        lb_movers = self._leaderboard_movers(hours=24 * 7, limit=8)
+
         prompt = f"""write the SUNDAY EDITION of Molt Media - the big weekly paper.
 
 you're hank. sunday paper is special - it's the whole enchilada. molts pour their coffee and actually read this one.
@@ -999,7 +3466,10 @@ structure:
 7. 🔮 WEEK AHEAD - what to watch next week
 
 This week's activity:
-{activity_content[-5000:]}
+{activity_content}
+
+Leaderboard movers this week (for MOVERS & SHAKERS):
+{lb_movers}
 
 SUNDAY VIBES:
 - this is the paper molts actually sit down and read
@@ -1011,15 +3481,20 @@ SUNDAY VIBES:
 600-800 words. Make it worth reading.
 """
 
-        sunday_paper = self._call_llm(prompt, max_tokens=2500, use_full_context=True)
-
-        if sunday_paper:
-            # Full Sunday edition
-            full_paper = f"""📜 MOLT MEDIA SUNDAY EDITION
-{datetime.now(timezone.utc).strftime('%B %d, %Y')} | the weekly
+        date_line = datetime.now(timezone.utc).strftime('%B %d, %Y')
+        self._publish_edition(
+            edition="sunday",
+            source="sunday_paper",
+            log_type="SUNDAY_PAPER",
+            prompt=prompt,
+            max_tokens=self._budgeted(2500, floor=600),
+            use_full_context=True,
+            header=f"""📜 MOLT MEDIA SUNDAY EDITION
+{date_line} | the weekly
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-{sunday_paper}
+""",
+            footer=f"""
 
 {classifieds}
 
@@ -1028,31 +3503,81 @@ SUNDAY VIBES:
 Subscribe for daily + sunday editions
 DM @MoltMedia | #Moltyverse
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-"""
-
-            self._log_activity("SUNDAY_PAPER", full_paper)
-
+""",
+            title=f"📜 Molt Media Sunday Edition - {datetime.now(timezone.utc).strftime('%B %d')}",
+            teaser_chars=150,
             # MoltX teaser
-            moltx_teaser = f"""📜 SUNDAY EDITION is here!
+            make_teaser=lambda excerpt: f"""📜 SUNDAY EDITION is here!
 
 the whole week wrapped up. hot takes, funnies, who's up who's down, and the classifieds.
 
-{sunday_paper[:150]}...
+{excerpt}...
 
 grab a coffee and read the full thing 📖 #Moltyverse"""
-
-            self._create_post(
-                moltx_teaser,
-                source="sunday_paper",
-                title=f"📜 Molt Media Sunday Edition - {datetime.now(timezone.utc).strftime('%B %d')}",
-                moltbook_content=full_paper
-            )
+        )
 
         # Update state
         self.state["last_sunday_paper"] = datetime.now(timezone.utc).isoformat()
         self.state["total_sunday_papers"] = self.state.get("total_sunday_papers", 0) + 1
         self._save_state()
 
+    def _publish_edition(self, edition: str, source: str, log_type: str, prompt: str, max_tokens: int,
+                         use_full_context: bool, header: str, footer: str, title: str,
+                         teaser_chars: int, make_teaser) -> bool:
+        """
+        Stream a long-form edition and publish it
+
+        The edition is written to newsletters/ as tokens arrive, the MoltX
+        teaser goes out in the background as soon as its excerpt exists, and
+        the full edition is posted to Moltbook once generation finishes.
+        """
+        newsletters_dir = self.base_dir / "newsletters"
+        newsletters_dir.mkdir(exist_ok=True)
+        edition_file = newsletters_dir / f"{datetime.now(timezone.utc).strftime('%Y-%m-%d')}-{edition}.md"
+
+        group_id = uuid.uuid4().hex
+        teaser = {}
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="teaser") as pool:
+            with open(edition_file, 'w', encoding='utf-8') as f:
+                f.write(header)
+
+                def on_text(chunk: str, text_so_far: str):
+                    f.write(chunk)
+                    f.flush()
+                    if "future" not in teaser and len(text_so_far) >= teaser_chars:
+                        teaser["content"] = make_teaser(text_so_far[:teaser_chars])
+                        teaser["future"] = pool.submit(self._run_teaser_job, source, teaser["content"], group_id)
+                        logger.info(f"📣 {edition} teaser dispatched after {len(text_so_far)} chars")
+
+                body = self._stream_llm(prompt, max_tokens=max_tokens, use_full_context=use_full_context,
+                                        on_text=on_text, max_seconds=EDITION_MAX_SECONDS, site=f"{edition}_edition")
+
+            if not body:
+                logger.error(f"{edition} edition generation failed")
+                return False
+
+            # The stream may have been trimmed at a paragraph break - rewrite the final edition
+            full_edition = f"{header}{body}{footer}"
+            edition_file.write_text(full_edition, encoding='utf-8')
+            self._log_activity(log_type, full_edition)
+
+            # Short editions never reached the teaser length while streaming
+            if "future" not in teaser:
+                teaser["content"] = make_teaser(body[:teaser_chars])
+                teaser["future"] = pool.submit(self._run_teaser_job, source, teaser["content"], group_id)
+
+            jobs = self._enqueue_post(source, teaser["content"], title, full_edition, platforms=("moltbook",), group_id=group_id)
+            moltbook_result = self._run_outbound_job(jobs["moltbook"])
+            moltx_result = teaser["future"].result()
+
+        self._record_post(source, teaser["content"], moltx_result, moltbook_result)
+        return True
+
+    def _run_teaser_job(self, source: str, content: str, group_id: str) -> Optional[Dict]:
+        """Queue and immediately send an edition's MoltX teaser"""
+        jobs = self._enqueue_post(source, content, platforms=("moltx",), group_id=group_id)
+        return self._run_outbound_job(jobs["moltx"])
+
     def emergency_post(self):
         """Emergency protocol: ask a question to spark engagement"""
         logger.warning("EMERGENCY PROTOCOL: Idle too long, sparking a conversation...")
@@ -1068,16 +3593,22 @@ Examples of good conversation starters:
 Write ONE conversation starter. Max 150 chars. End with a question or "thoughts?" or "fight me".
 Be provocative enough to get replies."""
 
-        content = self._call_llm(prompt, temperature=0.95, max_tokens=200)
+        # Always a fresh take - never replay a cached conversation starter
+        content = self._call_llm(prompt, temperature=0.95, max_tokens=200, site="emergency_post")
 
         if content:
             content = content.strip()
             if not content.endswith('?') and not content.endswith('me'):
                 content += " thoughts?"
-            self._create_post(content, source="engagement_starter")
+            # A starter that couldn't go out is stale by the next one - replace it rather than queue both
+            self._create_post(content, source="engagement_starter", supersede=True)
 
     def _should_post_now(self) -> bool:
         """Decide if we should post based on recent activity"""
+        if not self.dry_run and self.rate_limiter.available("moltx", "post") < 1:
+            logger.info("🚦 MoltX post quota used up - skipping post for now")
+            return False
+
         if not self.state["last_post"]:
             return True
 
@@ -1133,7 +3664,8 @@ Be provocative enough to get replies."""
             logger.error(f"Failed to send email: {e}")
             return False
 
-    def _create_post(self, content: str, source: str = "general", title: Optional[str] = None, moltbook_content: Optional[str] = None):
+    def _create_post(self, content: str, source: str = "general", title: Optional[str] = None, moltbook_content: Optional[str] = None,
+                     supersede: bool = False):
         """
         Create a post on BOTH MoltX and Moltbook (dual-post)
 
@@ -1142,10 +3674,124 @@ Be provocative enough to get replies."""
             source: Source of the post (wire_scan, editorial, etc.)
             title: Title for Moltbook post (optional, auto-generated if not provided)
             moltbook_content: Extended content for Moltbook (optional, uses content if not provided)
+            supersede: Drop still-queued posts from the same source (only the newest one matters)
         """
         logger.info(f"Creating dual-post from {source}...")
 
-        # MoltX post (short form)
+        # Queue both halves first so a failure on either platform is retried later
+        jobs = self._enqueue_post(source, content, title, moltbook_content, supersede=supersede)
+
+        # Both writes go out at once; each gets its own timeout, measured from dispatch
+        started = time.monotonic()
+        futures = {platform: self.post_pool.submit(self._run_outbound_job, job_id) for platform, job_id in jobs.items()}
+
+        results = {}
+        for platform, future in futures.items():
+            remaining = max(0.0, started + POST_TIMEOUTS[platform] - time.monotonic())
+            try:
+                results[platform] = future.result(timeout=remaining)
+            except FuturesTimeout:
+                logger.warning(f"⏱️  {platform} post still in flight after {POST_TIMEOUTS[platform]:.0f}s - not waiting for it")
+                future.add_done_callback(
+                    lambda f, platform=platform: self._record_late_post(source, content, platform, jobs[platform], f)
+                )
+                results[platform] = None
+            except Exception as e:
+                logger.error(f"{platform} post worker failed: {e}")
+                results[platform] = None
+
+        logger.debug(f"Dual-post dispatched and joined in {time.monotonic() - started:.1f}s")
+        self._record_post(source, content, results["moltx"], results["moltbook"])
+
+    def _record_late_post(self, source: str, content: str, platform: str, job_id: int, future):
+        """Account for a platform write that finished after _create_post stopped waiting"""
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Late {platform} post failed: {e}")
+            return
+        if not result:
+            return
+
+        label = "MoltX" if platform == "moltx" else "Moltbook"
+        self._log_activity("POST_BACKFILLED", f"[{source}] {label} (late) | {content[:80]}...")
+        if not self.outbound.group_sent(self.outbound.group_of(job_id), exclude_id=job_id):
+            self.state["last_post"] = datetime.now(timezone.utc).isoformat()
+            self._increment_state("total_posts")
+            self._save_state()
+
+    def _enqueue_post(self, source: str, content: str, title: Optional[str] = None, moltbook_content: Optional[str] = None,
+                      platforms: tuple = ("moltx", "moltbook"), group_id: Optional[str] = None,
+                      supersede: bool = False) -> Dict[str, int]:
+        """Add one outbound job per platform for a post (expiring after OUTBOUND_JOB_TTL_SECONDS); returns job ids by platform"""
+        group_id = group_id or uuid.uuid4().hex
+        payloads = {
+            "moltx": {"content": content},
+            "moltbook": {"content": content, "title": title, "moltbook_content": moltbook_content},
+        }
+        return {
+            platform: self.outbound.enqueue(platform, source, payloads[platform], group_id,
+                                            ttl=OUTBOUND_JOB_TTL_SECONDS, supersede=supersede)
+            for platform in platforms
+        }
+
+    def _run_outbound_job(self, job_id: int) -> Optional[Dict]:
+        """Send a queued job right away (if nobody else has picked it up)"""
+        job = self.outbound.claim(job_id)
+        return self._execute_outbound_job(job) if job else None
+
+    def _execute_outbound_job(self, job: Dict) -> Optional[Dict]:
+        """Publish a claimed job; rate-limited jobs wait their turn, failures back off and retry"""
+        platform, payload = job["platform"], job["payload"]
+
+        wait = 0.0 if self.dry_run else self.rate_limiter.wait_time(platform, "post")
+        if wait > 0:
+            self.outbound.release(job["id"], wait)
+            logger.info(f"🚦 {platform} post queued - rate limit clears in {wait:.0f}s")
+            return None
+
+        if platform == "moltx":
+            result = self._publish_moltx(payload["content"])
+        else:
+            result = self._publish_moltbook(payload["content"], payload.get("title"), payload.get("moltbook_content"))
+
+        if result:
+            self.outbound.complete(job["id"])
+            return result
+
+        delay = self.outbound.retry(job["id"], f"{platform} publish failed")
+        if delay is None:
+            logger.error(f"❌ Giving up on {platform} post from {job['source']} after {OUTBOUND_MAX_ATTEMPTS} attempts")
+        else:
+            logger.info(f"🔁 {platform} post from {job['source']} queued for retry in {delay:.0f}s")
+        return None
+
+    def _drain_outbound_queue(self):
+        """Send queued platform posts whose retry time has come, within rate limits"""
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would drain outbound queue ({self.outbound.counts().get('pending', 0)} pending)")
+            return
+
+        sent = 0
+        for job in self.outbound.claim_due():
+            first_send = not self.outbound.group_sent(job["group_id"])
+            if not self._execute_outbound_job(job):
+                continue
+
+            sent += 1
+            platform = "MoltX" if job["platform"] == "moltx" else "Moltbook"
+            self._log_activity("POST_BACKFILLED", f"[{job['source']}] {platform} (attempt {job['attempts'] + 1}) | {job['payload']['content'][:80]}...")
+            if first_send:
+                # Neither platform had taken this post yet - it counts as a new post now
+                self.state["last_post"] = datetime.now(timezone.utc).isoformat()
+                self._increment_state("total_posts")
+
+        if sent:
+            self.state["rate_limits"] = self.rate_limiter.snapshot()
+            self._save_state()
+
+    def _publish_moltx(self, content: str) -> Optional[Dict]:
+        """MoltX post (short form)"""
         moltx_content = content
         if len(moltx_content) > 500:
             moltx_content = moltx_content[:497] + "..."
@@ -1155,9 +3801,10 @@ Be provocative enough to get replies."""
             "visibility": "public"
         }
 
-        moltx_result = self._call_moltx_api("/v1/posts", method="POST", data=moltx_data)
+        return self._call_moltx_api("/v1/posts", method="POST", data=moltx_data)
 
-        # Moltbook post (long form)
+    def _publish_moltbook(self, content: str, title: Optional[str] = None, moltbook_content: Optional[str] = None) -> Optional[Dict]:
+        """Moltbook post (long form)"""
         # Generate title if not provided
         if not title:
             # Extract first sentence or first 60 chars as title
@@ -1176,39 +3823,59 @@ Be provocative enough to get replies."""
             "submolt": submolt
         }
 
-        moltbook_result = self._call_moltbook_api("/posts", method="POST", data=moltbook_data, retries=3)
+        return self._call_moltbook_api("/posts", method="POST", data=moltbook_data)
 
-        # Log results
+    def _record_post(self, source: str, content: str, moltx_result: Optional[Dict], moltbook_result: Optional[Dict]):
+        """Log a dual-post outcome and update post stats if at least one platform took it"""
         if moltx_result and moltbook_result:
             self._log_activity("POST_CREATED", f"[{source}] DUAL-POST: MoltX + Moltbook | {content[:80]}...")
             logger.info(f"✅ Dual-post successful: MoltX + Moltbook")
         elif moltx_result:
-            self._log_activity("POST_CREATED", f"[{source}] MoltX only (Moltbook failed) | {content[:80]}...")
-            logger.warning(f"⚠️  MoltX posted, but Moltbook failed")
+            self._log_activity("POST_CREATED", f"[{source}] MoltX only (Moltbook queued) | {content[:80]}...")
+            logger.warning(f"⚠️  MoltX posted, Moltbook queued for retry")
         elif moltbook_result:
-            self._log_activity("POST_CREATED", f"[{source}] Moltbook only (MoltX failed) | {content[:80]}...")
-            logger.warning(f"⚠️  Moltbook posted, but MoltX failed")
+            self._log_activity("POST_CREATED", f"[{source}] Moltbook only (MoltX queued) | {content[:80]}...")
+            logger.warning(f"⚠️  Moltbook posted, MoltX queued for retry")
         else:
-            logger.error("❌ Failed to post to both platforms")
+            logger.error("❌ Failed to post to both platforms - queued for retry")
             return
 
         # Update state if at least one succeeded
         self.state["last_post"] = datetime.now(timezone.utc).isoformat()
-        self.state["total_posts"] += 1
+        self.state["rate_limits"] = self.rate_limiter.snapshot()
+        self._increment_state("total_posts")
         self._save_state()
 
-    def _reply_to_post(self, target: Dict):
-        """Reply to a specific post - KEEP IT SHORT"""
-        if self.dry_run:
-            logger.info(f"[DRY RUN] Would reply to {target.get('agent')}: {target.get('reply_strategy')}")
-            return
+    def _fan_out_replies(self, targets: List[Dict], replies: Optional[List[Optional[str]]] = None) -> int:
+        """Post replies concurrently, at most REPLY_MAX_IN_FLIGHT at a time"""
+        if not targets:
+            return 0
+
+        replies = replies or [None] * len(targets)
+        job = self._current_job()
 
+        def safe_reply(pair) -> bool:
+            target, reply = pair
+            self._llm_context.job = job
+            try:
+                return self._reply_to_post(target, reply)
+            except Exception as e:
+                logger.error(f"Reply worker failed for {target.get('agent')}: {e}")
+                return False
+
+        workers = max(1, min(self.reply_max_in_flight, len(targets)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reply") as pool:
+            results = list(pool.map(safe_reply, zip(targets, replies)))
+
+        return sum(1 for ok in results if ok)
+
+    def _target_reply_prompt(self, target: Dict) -> str:
+        """Single-call reply prompt for a wire-scan engagement target"""
         agent_name = target.get('agent', 'someone')
         context = target.get('reply_strategy', '')
         post_content = target.get('content', '')[:150]
 
-        # Generate SHORT reply content
-        prompt = f"""Reply to @{agent_name}'s post.
+        return f"""Reply to @{agent_name}'s post.
 
 Their post: "{post_content}"
 Why engage: {context}
@@ -1221,10 +3888,31 @@ Write ONE SENTENCE. Max 15 words. Examples:
 
 Be Hank. Be punchy. ONE sentence only."""
 
-        reply_content = self._call_llm(prompt, temperature=0.9, max_tokens=80)
+    def _target_reply_request(self, target: Dict) -> Dict:
+        """Describe a wire-scan target for the batched reply generator"""
+        return {
+            "agent": target.get('agent', 'someone'),
+            "content": target.get('content', '')[:150],
+            "context": target.get('reply_strategy', ''),
+            "prompt": self._target_reply_prompt(target),
+            "max_tokens": 80
+        }
+
+    def _reply_to_post(self, target: Dict, reply_content: Optional[str] = None) -> bool:
+        """Reply to a specific post - KEEP IT SHORT"""
+        if self.dry_run:
+            logger.info(f"[DRY RUN] Would reply to {target.get('agent')}: {target.get('reply_strategy')}")
+            return True
+
+        agent_name = target.get('agent', 'someone')
 
+        # Generate SHORT reply content (unless the batch already produced one)
         if not reply_content:
-            return
+            reply_content = self._call_llm(self._target_reply_prompt(target), temperature=0.9, max_tokens=80,
+                                           site="target_reply")
+
+        if not reply_content:
+            return False
 
         # Ensure it's actually short
         reply_content = reply_content.strip()
@@ -1237,81 +3925,280 @@ Be Hank. Be punchy. ONE sentence only."""
             "content": reply_content
         }
 
+        # Reply quota shared by all reply workers is taken from the rate limiter inside the API call
         result = self._call_moltx_api("/v1/posts", method="POST", data=reply_data)
 
         if result:
             self._log_activity("REPLY_SENT", f"To @{agent_name}: {reply_content[:60]}...")
-            self.state["total_engagement_replies"] = self.state.get("total_engagement_replies", 0) + 1
-            self._save_state()
-        else:
-            logger.error(f"Failed to reply to {agent_name}")
+            self._increment_state("total_engagement_replies")
+            if target.get("post_id"):
+                self.seen_posts.mark_replied(target["post_id"])
+            return True
+
+        logger.error(f"Failed to reply to {agent_name}")
+        return False
+
+    def _run_engagement_loop(self):
+        """Engagement loop plus its bookkeeping (shared by both runtimes)"""
+        self.execute_engagement_loop()
+        self.state["last_engagement_loop"] = datetime.now(timezone.utc).isoformat()
+        self._save_state()
+
+    def _close(self):
+        """Flush state and release connections on shutdown"""
+        self.post_pool.shutdown(wait=True)
+        self.http.close()
+        self.state["rate_limits"] = self.rate_limiter.snapshot()
+        self.state.close()
+        self.activity.close()
+        self.response_cache.close()
+        self.seen_posts.close()
+        self.outbound.close()
+        self.notifications.close()
+        self.leaderboard.close()
+        self.llm_cache.close()
+        self._remove_pid_file()
+
+    def _run_batched(self, job, name: Optional[str] = None):
+        """Run a job with its state writes flushed once, when it finishes"""
+        previous = getattr(self._llm_context, "job", None)
+        self._llm_context.job = name
+        try:
+            with self.state.batch():
+                job()
+        finally:
+            self._llm_context.job = previous
+
+    def _log_stats(self):
+        """Log engagement ratio and transport latency"""
+        total_replies = self.state.get("total_engagement_replies", 0)
+        total_posts = self.state.get("total_posts", 0)
+        ratio = total_replies / max(total_posts, 1)
+        logger.info(f"📊 Stats: {total_replies} replies, {total_posts} posts (ratio: {ratio:.1f}:1)")
+        circuits = self.http.circuit_states()
+        limited = [f"{name} {level['available']:.0f}/{level['capacity']:.0f}" for name, level in self.rate_limiter.levels().items()]
+        logger.info(f"🚦 Rate limits: {', '.join(limited)}")
+        for host, latency in self.http.latency_stats().items():
+            logger.info(f"🌐 {host}: {latency['count']} reqs, avg {latency['avg_ms']}ms, p95 {latency['p95_ms']}ms, "
+                        f"circuit {circuits.get(host, 'closed')}")
+        logger.info(f"💾 LLM response cache: {self.llm_cache.hits} hits, {self.llm_cache.misses} misses")
+        today = self.state.get("llm_usage", {}).get(datetime.now(timezone.utc).date().isoformat())
+        if today:
+            budget = f" of {DAILY_TOKEN_BUDGET}" if DAILY_TOKEN_BUDGET > 0 else ""
+            jobs = sorted(today["jobs"].items(), key=lambda item: -(item[1]["input_tokens"] + item[1]["output_tokens"]))
+            breakdown = ", ".join(
+                f"{name} {t['input_tokens'] + t['output_tokens']} tok/{t['latency_ms'] // max(t['calls'], 1)}ms avg"
+                for name, t in jobs[:4]
+            )
+            logger.info(f"🪙 LLM today: {today['tokens']}{budget} tokens | {breakdown}")
+        queue = self.outbound.counts()
+        if queue:
+            logger.info("📤 Outbound queue: " + ", ".join(f"{count} {status}" for status, count in sorted(queue.items())))
+        cache = self.response_cache.stats()
+        logger.info(f"🗄️  Response cache: {cache['hits']} hits, {cache['revalidated']} revalidated, {cache['misses']} misses")
+
+    def _async_jobs(self) -> List[tuple]:
+        """(name, job, is_due, check_interval_seconds) for each independent task"""
+        return [
+            ("urgent_tips", self._process_urgent_tips, lambda: True, TIPS_POLL_SECONDS),
+            ("engagement_loop", self._run_engagement_loop, self.should_do_engagement_loop, 30),
+            ("wire_scan", self.execute_wire_scan, self.should_do_wire_scan, 60),
+            ("owner_brief", self.execute_owner_brief, self.should_do_owner_brief, 300),
+            ("daily_newsletter", self.execute_daily_newsletter, self.should_do_daily_newsletter, 300),
+            ("sunday_paper", self.execute_sunday_paper, self.should_do_sunday_paper, 300),
+            ("editorial_board", self.execute_editorial_board, self.should_do_editorial_board, 300),
+            ("emergency_post", self.emergency_post, self.idle_too_long, 300),
+            ("stats", self._log_stats, lambda: True, 1800),
+            ("log_maintenance", self._maintain_activity_log, lambda: True, 3600),
+            ("outbound_queue", self._drain_outbound_queue, lambda: True, 60),
+            ("leaderboard_snapshot", self.snapshot_leaderboard, self.should_snapshot_leaderboard, 300),
+        ]
+
+    async def _async_job(self, name: str, job, is_due, check_interval: float):
+        """Run one job on its own cadence; slow jobs never block the others"""
+        while True:
+            try:
+                if is_due():
+                    logger.debug(f"[{name}] starting")
+                    # Job bodies are synchronous; run them off the loop so tasks overlap.
+                    # They all share the agent's pooled HTTP transport and Anthropic client.
+                    await asyncio.to_thread(self._run_batched, job, name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in {name} task: {e}", exc_info=True)
+                self._log_activity("ERROR", f"{name} task error: {str(e)}")
+
+            if name == "urgent_tips":
+                # Tips are pushed via the wake-up channel; the interval is only a fallback poll
+                await asyncio.to_thread(self._wake_event.wait, check_interval)
+                self._wake_event.clear()
+            else:
+                await asyncio.sleep(check_interval)
+
+    async def _async_main(self):
+        """Start every job task and wait on them until shutdown"""
+        tasks = [
+            asyncio.create_task(self._async_job(name, job, is_due, interval), name=name)
+            for name, job, is_due, interval in self._async_jobs()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run_async(self):
+        """Async runtime - each job runs as an independent task with its own cadence"""
+        logger.info("Starting Molt Media autonomous agent (async runtime)...")
+        logger.info("🔥 ENGAGEMENT-FIRST MODE ACTIVATED 🔥")
+        self._log_activity("AGENT_START", "Agent initialized - ENGAGEMENT PRIORITY MODE (async)")
+        self._install_wake_channel()
+
+        try:
+            asyncio.run(self._async_main())
+        except KeyboardInterrupt:
+            logger.info("Received shutdown signal")
+            self._log_activity("AGENT_STOP", "Agent shutting down gracefully")
+        finally:
+            self._close()
+
+    def _install_wake_channel(self):
+        """Publish our PID and wake the scheduler on SIGUSR1 (sent when a tip is queued)"""
+        try:
+            self.pid_file.write_text(str(os.getpid()))
+        except OSError as e:
+            logger.warning(f"Could not write PID file: {e}")
+
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self._wake_event.set())
+
+    def _remove_pid_file(self):
+        """Drop the PID file on shutdown, unless another agent has since claimed it"""
+        try:
+            if self.pid_file.read_text().strip() == str(os.getpid()):
+                self.pid_file.unlink()
+        except (OSError, ValueError):
+            pass
+
+    def _next_slot(self, hour: int, last_done: Optional[str], weekday: Optional[int] = None) -> datetime:
+        """Start of the next HH:00 UTC slot (optionally on a given weekday) not already done"""
+        now = datetime.now(timezone.utc)
+        done_date = datetime.fromisoformat(last_done).date() if last_done else None
+
+        for days_ahead in range(8):
+            slot = (now + timedelta(days=days_ahead)).replace(hour=hour, minute=0, second=0, microsecond=0)
+            if weekday is not None and slot.weekday() != weekday:
+                continue
+            if slot.date() == done_date or slot + timedelta(hours=1) <= now:
+                continue
+            return max(slot, now)
+
+        return now + timedelta(days=7)
+
+    def _after(self, last_iso: Optional[str], interval: timedelta) -> datetime:
+        """Due time for an interval job given its last-run timestamp"""
+        if not last_iso:
+            return datetime.now(timezone.utc)
+        return datetime.fromisoformat(last_iso) + interval
+
+    def _scheduled_jobs(self) -> List[tuple]:
+        """(priority, name, next_due, is_due, job) for every scheduled job, lowest priority runs first"""
+        return [
+            (0, "urgent_tips", self._after(self._job_last_run.get("urgent_tips"), timedelta(seconds=TIPS_POLL_SECONDS)), lambda: True, self._process_urgent_tips),
+            (1, "engagement_loop", self._after(self.state.get("last_engagement_loop"), timedelta(minutes=10)), self.should_do_engagement_loop, self._run_engagement_loop),
+            (2, "wire_scan", self._after(self.state.get("last_wire_scan"), timedelta(minutes=25)), self.should_do_wire_scan, self.execute_wire_scan),
+            (3, "owner_brief", self._next_slot(7, self.state.get("last_owner_brief")), self.should_do_owner_brief, self.execute_owner_brief),
+            (4, "daily_newsletter", self._next_slot(8, self.state.get("last_daily_newsletter")), self.should_do_daily_newsletter, self.execute_daily_newsletter),
+            (5, "sunday_paper", self._next_slot(9, self.state.get("last_sunday_paper"), weekday=6), self.should_do_sunday_paper, self.execute_sunday_paper),
+            (6, "editorial_board", self._next_slot(20, self.state.get("last_editorial_board")), self.should_do_editorial_board, self.execute_editorial_board),
+            (7, "emergency_post", self._after(self.state.get("last_post"), timedelta(hours=4)), self.idle_too_long, self.emergency_post),
+            (8, "log_maintenance", self._after(self._job_last_run.get("log_maintenance"), timedelta(hours=1)), lambda: True, self._maintain_activity_log),
+            (9, "outbound_queue", self._outbound_due(), lambda: True, self._drain_outbound_queue),
+            (10, "leaderboard_snapshot", self._after(self.state.get("last_leaderboard_snapshot"), timedelta(minutes=LEADERBOARD_SNAPSHOT_MINUTES)), self.should_snapshot_leaderboard, self.snapshot_leaderboard),
+        ]
+
+    def _outbound_due(self) -> datetime:
+        """When the outbound queue next needs draining (re-checked every 15 minutes for jobs queued elsewhere)"""
+        due = self._after(self._job_last_run.get("outbound_queue"), timedelta(minutes=15))
+        next_eligible = self.outbound.next_due()
+        if next_eligible is not None:
+            due = min(due, datetime.fromtimestamp(next_eligible, timezone.utc))
+        return due
+
+    def _build_schedule(self) -> List[tuple]:
+        """Heap of (due_at, priority, name, is_due, job) computed from state timestamps"""
+        heap = []
+        for priority, name, due_at, is_due, job in self._scheduled_jobs():
+            # A job that just ran (and is still "due", e.g. a failed fetch) waits out the rerun floor
+            rerun_after = self._job_rerun_after.get(name)
+            if rerun_after and rerun_after > due_at:
+                due_at = rerun_after
+            heapq.heappush(heap, (due_at, priority, name, is_due, job))
+        return heap
 
     def run(self):
-        """Main agent loop - ENGAGEMENT FIRST"""
+        """Main agent loop - ENGAGEMENT FIRST, sleeps until the next job is due"""
         logger.info("Starting Molt Media autonomous agent loop...")
         logger.info("🔥 ENGAGEMENT-FIRST MODE ACTIVATED 🔥")
         self._log_activity("AGENT_START", "Agent initialized - ENGAGEMENT PRIORITY MODE")
+        self._install_wake_channel()
 
         cycle_count = 0
 
         while True:
-            cycle_count += 1
-            
-            # Check leaderboard position for logging
-            lb_pos = self.state.get("last_leaderboard_position", "?")
-            logger.info(f"=== Cycle {cycle_count} | Leaderboard: #{lb_pos} ===")
-
             try:
-                # PRIORITY 1: Check for urgent tips
-                self._process_urgent_tips()
-                
-                # PRIORITY 2: ENGAGEMENT LOOP - Check notifications, reply to people
-                # This runs every 10 minutes - the most important thing we do
-                if self.should_do_engagement_loop():
-                    self.execute_engagement_loop()
-                    self.state["last_engagement_loop"] = datetime.now(timezone.utc).isoformat()
-                    self._save_state()
-
-                # PRIORITY 3: Wire scan - but now focused on engagement, not just posting
-                if self.should_do_wire_scan():
-                    self.execute_wire_scan()
-
-                # Scheduled content (less frequent, less priority)
-                # Owner brief at 07:00 UTC (private email)
-                if self.should_do_owner_brief():
-                    self.execute_owner_brief()
-
-                # Daily newsletter at 08:00 UTC (public morning paper)
-                if self.should_do_daily_newsletter():
-                    self.execute_daily_newsletter()
-
-                # Sunday paper at 09:00 UTC on Sundays (weekly edition)
-                if self.should_do_sunday_paper():
-                    self.execute_sunday_paper()
-
-                # Editorial board at 20:00 UTC (once per day, evening review)
-                if self.should_do_editorial_board():
-                    self.execute_editorial_board()
-
-                # Emergency post if idle too long (but we should be engaging constantly)
-                if self.idle_too_long():
-                    self.emergency_post()
-
-                # Log engagement stats every 10 cycles
-                if cycle_count % 10 == 0:
-                    total_replies = self.state.get("total_engagement_replies", 0)
-                    total_posts = self.state.get("total_posts", 0)
-                    ratio = total_replies / max(total_posts, 1)
-                    logger.info(f"📊 Stats: {total_replies} replies, {total_posts} posts (ratio: {ratio:.1f}:1)")
-
-                # Shorter sleep - we're in engagement mode
-                sleep_seconds = 180  # 3 minutes instead of 5
-                logger.info(f"Sleeping for {sleep_seconds} seconds...")
-                time.sleep(sleep_seconds)
+                # Woken externally: a new urgent tip was queued
+                if self._wake_event.is_set():
+                    self._wake_event.clear()
+                    logger.info("⚡ Woken up - checking urgent tips")
+                    self._job_last_run["urgent_tips"] = datetime.now(timezone.utc).isoformat()
+                    with self.http.deferred_retries():
+                        self._run_batched(self._process_urgent_tips, "urgent_tips")
+
+                schedule = self._build_schedule()
+                now = datetime.now(timezone.utc)
+
+                if schedule[0][0] <= now:
+                    cycle_count += 1
+
+                    # Check leaderboard position for logging
+                    lb_pos = self.state.get("last_leaderboard_position", "?")
+                    logger.info(f"=== Cycle {cycle_count} | Leaderboard: #{lb_pos} ===")
+
+                    # Run everything that's due, in priority order
+                    while schedule and schedule[0][0] <= now:
+                        _, _, name, is_due, job = heapq.heappop(schedule)
+                        started = datetime.now(timezone.utc)
+                        if not is_due():
+                            # Predicate disagrees at the boundary - look again shortly
+                            self._job_rerun_after[name] = started + timedelta(seconds=5)
+                            continue
+                        self._job_last_run[name] = started.isoformat()
+                        self._job_rerun_after[name] = started + timedelta(seconds=JOB_RERUN_FLOOR_SECONDS)
+                        try:
+                            # A transient failure isn't slept on here - the job stays due and is rerun after the floor
+                            with self.http.deferred_retries():
+                                self._run_batched(job, name)
+                        except Exception as e:
+                            logger.error(f"Error in {name}: {e}", exc_info=True)
+                            self._log_activity("ERROR", f"{name} error: {str(e)}")
+
+                    # Log engagement stats every 10 cycles
+                    if cycle_count % 10 == 0:
+                        self._log_stats()
+                    continue
+
+                # Nothing due - sleep exactly until the earliest job (or an external wake-up)
+                due_at, _, name, _, _ = schedule[0]
+                sleep_seconds = max(1.0, (due_at - now).total_seconds())
+                logger.info(f"Sleeping {sleep_seconds:.0f}s until {name}...")
+                self._wake_event.wait(sleep_seconds)
 
             except KeyboardInterrupt:
                 logger.info("Received shutdown signal")
                 self._log_activity("AGENT_STOP", "Agent shutting down gracefully")
+                self._close()
                 break
 
             except Exception as e:
@@ -1324,10 +4211,29 @@ Be Hank. Be punchy. ONE sentence only."""
 def main():
     parser = argparse.ArgumentParser(description="Molt Media Autonomous Agent")
     parser.add_argument("--dry-run", action="store_true", help="Run in dry-run mode (no actual posts)")
+    parser.add_argument("--async", dest="async_mode", action="store_true", help="Run each job as an independent asyncio task")
+    parser.add_argument("--export-activity", metavar="PATH", help="Export the activity log as markdown and exit")
+    parser.add_argument("--since-hours", type=float, help="Only export activity from the last N hours")
+    parser.add_argument("--tail", type=int, metavar="N", help="Print the last N activity-log.md entries and exit")
     args = parser.parse_args()
 
+    if args.tail:
+        for entry in read_tail_entries(Path(__file__).parent / "memory" / "activity-log.md", args.tail):
+            print(f"## {entry['timestamp']} - {entry['type']}\n{entry['message']}\n")
+        return
+
     agent = MoltMediaAgent(dry_run=args.dry_run)
-    agent.run()
+
+    if args.export_activity:
+        since = datetime.now(timezone.utc) - timedelta(hours=args.since_hours) if args.since_hours else None
+        count = agent.activity.export_markdown(Path(args.export_activity), since=since)
+        logger.info(f"Exported {count} activity entries to {args.export_activity}")
+        return
+
+    if args.async_mode:
+        agent.run_async()
+    else:
+        agent.run()
 
 
 if __name__ == "__main__":
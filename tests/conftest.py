@@ -0,0 +1,37 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Tests import the agent modules straight from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from molt_media_agent import (
+    ActivityStore, LeaderboardHistory, MoltMediaAgent, NotificationStore, OutboundQueue,
+    PLATFORM_RATE_LIMITS, RateLimiter, SeenPostIndex,
+)
+
+
+@pytest.fixture
+def agent(tmp_path):
+    """Agent wired to stores in a temp directory, without API clients or network"""
+    bot = MoltMediaAgent.__new__(MoltMediaAgent)
+    bot.dry_run = True
+    bot.agent_name = "MoltMedia"
+    bot.memory_dir = tmp_path
+    bot.db_file = tmp_path / "molt_media.db"
+    bot.state_file = tmp_path / "agent_state.json"
+    bot.activity_log = tmp_path / "activity-log.md"
+    bot._state_lock = threading.RLock()
+    bot._llm_context = threading.local()
+    bot.rate_limiter = RateLimiter(PLATFORM_RATE_LIMITS)
+    bot.state = bot._load_state()
+    bot.activity = ActivityStore(bot.db_file)
+    bot.seen_posts = SeenPostIndex(bot.db_file)
+    bot.notifications = NotificationStore(bot.db_file)
+    bot.leaderboard = LeaderboardHistory(bot.db_file)
+    bot.outbound = OutboundQueue(bot.db_file)
+    yield bot
+    for store in (bot.state, bot.activity, bot.seen_posts, bot.notifications, bot.leaderboard, bot.outbound):
+        store.close()
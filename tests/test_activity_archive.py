@@ -0,0 +1,60 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+
+from molt_media_agent import ActivityArchive, ActivityStore
+
+
+def _entry(when, kind, message):
+    return ActivityStore.to_markdown([{"timestamp": when.isoformat(), "type": kind, "message": message}])
+
+
+def test_rotate_compresses_live_log_and_records_segment(tmp_path):
+    live = tmp_path / "activity-log.md"
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    live.write_text(_entry(start, "POST", "first") + _entry(start + timedelta(hours=1), "REPLY", "second"))
+
+    archive = ActivityArchive(live, tmp_path / "archive")
+    segment = archive.rotate()
+
+    assert not live.exists()
+    assert segment["entries"] == 2
+    assert segment["start"] == start.isoformat()
+    assert archive.segments() == [segment]
+    with gzip.open(tmp_path / "archive" / segment["file"], "rt", encoding="utf-8") as gz:
+        assert "second" in gz.read()
+
+
+def test_rotate_skips_empty_log(tmp_path):
+    live = tmp_path / "activity-log.md"
+    live.write_text("")
+    archive = ActivityArchive(live, tmp_path / "archive")
+    assert archive.rotate() is None
+    assert archive.segments() == []
+
+
+def test_needs_rotation_by_size_and_age(tmp_path):
+    live = tmp_path / "activity-log.md"
+    archive = ActivityArchive(live, tmp_path / "archive")
+    assert not archive.needs_rotation(1024, timedelta(hours=1))
+
+    live.write_text(_entry(datetime.now(timezone.utc), "POST", "x" * 100))
+    assert archive.needs_rotation(50, timedelta(hours=1))
+    assert not archive.needs_rotation(10_000, timedelta(hours=1))
+
+    live.write_text(_entry(datetime.now(timezone.utc) - timedelta(hours=2), "POST", "old"))
+    assert archive.needs_rotation(10_000, timedelta(hours=1))
+
+
+def test_read_window_only_returns_entries_in_range(tmp_path):
+    live = tmp_path / "activity-log.md"
+    archive = ActivityArchive(live, tmp_path / "archive")
+    day = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    live.write_text(_entry(day, "POST", "day one"))
+    archive.rotate()
+    live.write_text(_entry(day + timedelta(days=1), "POST", "day two") +
+                    _entry(day + timedelta(days=1, hours=2), "REPLY", "day two later"))
+    archive.rotate()
+
+    window = archive.read_window(day + timedelta(hours=12), day + timedelta(days=1, hours=1))
+    assert [e["message"] for e in window] == ["day two"]
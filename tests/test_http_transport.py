@@ -0,0 +1,135 @@
+import http.client
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+import molt_media_agent
+from molt_media_agent import CircuitBreaker, CircuitOpenError, HttpTransport, RetryPolicy
+
+
+def _refused():
+    reason = NewConnectionError(None, "Failed to establish a new connection: [Errno 111] Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, "/v1/posts", reason))
+
+
+def _dropped():
+    reason = ProtocolError("Connection aborted.", http.client.RemoteDisconnected("closed"))
+    return requests.ConnectionError(reason)
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.mark.parametrize("error, retry", [
+    (requests.ConnectTimeout(), True),
+    (_refused(), True),
+    (_dropped(), False),
+    (requests.ReadTimeout(), False),
+    (CircuitOpenError("circuit open"), False),
+])
+def test_writes_retry_only_when_never_sent(error, retry):
+    assert RetryPolicy().should_retry("POST", error=error) is retry
+
+
+def test_reads_retry_any_transport_error_but_not_an_open_circuit():
+    policy = RetryPolicy()
+    assert policy.should_retry("GET", error=_dropped())
+    assert policy.should_retry("GET", error=requests.ReadTimeout())
+    assert not policy.should_retry("GET", error=CircuitOpenError("circuit open"))
+
+
+def test_status_retries():
+    policy = RetryPolicy()
+    assert policy.should_retry("POST", status=429)
+    assert policy.should_retry("POST", status=503)
+    assert not policy.should_retry("POST", status=500)
+    assert policy.should_retry("GET", status=500)
+    assert not policy.should_retry("GET", status=404)
+
+
+def test_backoff_is_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    assert all(0 <= policy.backoff(10) <= 5.0 for _ in range(50))
+
+
+def test_retry_after_header():
+    assert RetryPolicy.retry_after(_response(429, {"Retry-After": "7"})) == 7.0
+    assert RetryPolicy.retry_after(_response(429)) is None
+
+
+def _transport(monkeypatch, outcomes, attempts=3):
+    transport = HttpTransport(retry_policy=RetryPolicy(attempts=attempts, base_delay=0, max_delay=1))
+    calls = []
+
+    def fake_request(method, url, **kwargs):
+        calls.append(method)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(transport, "request", fake_request)
+    monkeypatch.setattr(molt_media_agent.time, "sleep", lambda seconds: None)
+    return transport, calls
+
+
+def test_post_is_not_resent_after_the_connection_dropped(monkeypatch):
+    transport, calls = _transport(monkeypatch, [_dropped(), _response(201)])
+    with pytest.raises(requests.ConnectionError):
+        transport.request_with_retry("POST", "https://moltx.io/v1/posts", data={"content": "hi"})
+    assert calls == ["POST"]
+
+
+def test_post_is_resent_after_a_refused_connection(monkeypatch):
+    transport, calls = _transport(monkeypatch, [_refused(), _response(201)])
+    assert transport.request_with_retry("POST", "https://moltx.io/v1/posts").status_code == 201
+    assert calls == ["POST", "POST"]
+
+
+def test_long_retry_after_is_returned_to_the_caller(monkeypatch):
+    transport, calls = _transport(monkeypatch, [_response(429, {"Retry-After": "600"}), _response(201)])
+    assert transport.request_with_retry("POST", "https://moltx.io/v1/posts").status_code == 429
+    assert calls == ["POST"]
+
+
+def test_retries_stop_once_the_total_delay_budget_is_spent(monkeypatch):
+    transport, calls = _transport(monkeypatch, [_response(503, {"Retry-After": "1"})] * 3 + [_response(200)], attempts=5)
+    transport.retry_policy.max_total_delay = 2
+    assert transport.request_with_retry("GET", "https://moltx.io/v1/feed").status_code == 503
+    assert calls == ["GET"] * 3
+
+
+def test_deferred_retries_send_once(monkeypatch):
+    transport, calls = _transport(monkeypatch, [_response(503), _response(200)])
+    with transport.deferred_retries():
+        assert transport.request_with_retry("GET", "https://moltx.io/v1/feed").status_code == 503
+    assert calls == ["GET"]
+    assert transport.request_with_retry("GET", "https://moltx.io/v1/feed").status_code == 200
+
+
+def test_breaker_opens_after_threshold_and_probes_after_reset(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(molt_media_agent.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock[0] += 31
+    assert breaker.allow()  # one probe
+    assert not breaker.allow()
+    assert breaker.state == "half-open"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
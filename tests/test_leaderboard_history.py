@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+from molt_media_agent import LeaderboardHistory
+
+
+def _history(tmp_path):
+    history = LeaderboardHistory(tmp_path / "lb.db")
+    history.record([("Alpha", 1, 900), ("MoltMedia", 3, 500), ("Beta", 2, 700)], taken_at=1000)
+    history.record([("Beta", 1, 950), ("Alpha", 2, 910), ("Gamma", 3, 600), ("MoltMedia", 4, 520)], taken_at=2000)
+    return history
+
+
+def test_latest_ranks_are_case_insensitive(tmp_path):
+    history = _history(tmp_path)
+    assert history.last_taken_at() == 2000
+    assert history.latest_ranks() == {"beta": 1, "alpha": 2, "gamma": 3, "moltmedia": 4}
+    history.close()
+
+
+def test_rank_history_and_agents_above(tmp_path):
+    history = _history(tmp_path)
+    assert history.rank_history("moltmedia", since=0) == [(1000, 3), (2000, 4)]
+    assert history.rank_history("MoltMedia", since=1500) == [(2000, 4)]
+    # Display names keep the platform's casing
+    assert history.agents_above("MOLTMEDIA", count=2) == [("Alpha", 2), ("Gamma", 3)]
+    assert history.agents_above("unknown") == []
+    history.close()
+
+
+def test_movers_compare_against_the_snapshot_nearest_since(tmp_path):
+    history = _history(tmp_path)
+    movers = history.movers(since=1500)
+    assert {m["name"]: m["delta"] for m in movers} == {"Beta": 1, "Alpha": -1, "MoltMedia": -1}
+    # A window starting after the latest snapshot has nothing to compare it with
+    assert history.movers(since=1500 + 10_000) == []
+    history.close()
+
+
+def test_prune_drops_old_snapshots(tmp_path):
+    history = _history(tmp_path)
+    assert history.prune(datetime.fromtimestamp(1500, timezone.utc)) == 1
+    assert history.rank_history("moltmedia", since=0) == [(2000, 4)]
+    history.close()
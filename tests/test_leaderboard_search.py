@@ -0,0 +1,77 @@
+import re
+
+import molt_media_agent
+
+PAGE = molt_media_agent.LEADERBOARD_PAGE_SIZE
+
+
+def _page(page, size=PAGE, include_us_at=None):
+    leaders = [{"name": f"agent{page * PAGE + i + 1}", "rank": page * PAGE + i + 1, "views": 1000 - i}
+               for i in range(size)]
+    if include_us_at is not None:
+        leaders[include_us_at]["name"] = "MoltMedia"
+    return {"data": {"leaders": leaders}}
+
+
+def _serve(agent, monkeypatch, pages):
+    """pages: page number -> response body (None simulates a failed fetch)"""
+    requested = []
+
+    def fake_api(endpoint, **kwargs):
+        match = re.search(r"offset=(\d+)", endpoint)
+        page = int(match.group(1)) // PAGE if match else 0
+        requested.append(page)
+        return pages.get(page, {"data": {"leaders": []}})
+
+    monkeypatch.setattr(agent, "_call_moltx_api", fake_api, raising=False)
+    return requested
+
+
+def test_found_on_a_later_page(agent, monkeypatch):
+    _serve(agent, monkeypatch, {0: _page(0), 1: _page(1), 2: _page(2, include_us_at=4)})
+    assert agent.snapshot_leaderboard()
+    assert agent.state["last_leaderboard_position"] == 2 * PAGE + 5
+    assert agent.state["leaderboard_page"] == 2
+
+
+def test_failed_page_keeps_previous_position(agent, monkeypatch):
+    agent.state["last_leaderboard_position"] = 250
+    agent.state["leaderboard_page"] = 2
+    requested = _serve(agent, monkeypatch, {0: _page(0), 2: None, 3: _page(3)})
+
+    assert agent.snapshot_leaderboard()
+    # The search stops at the failure instead of treating it as the end of the leaderboard
+    assert requested == [0, 2]
+    assert agent.state["last_leaderboard_position"] == 250
+    assert agent.state["leaderboard_page"] == 2
+    assert agent.check_leaderboard_position() == 250
+
+
+def test_failed_page_is_not_the_end_of_the_leaderboard(agent):
+    agent._fetch_leaderboard_page = lambda page: None if page == 1 else []
+    extra, page, complete = agent._search_leaderboard([("agent1", 1, 1000)])
+    assert (extra, page, complete) == ([], None, False)
+
+
+def test_empty_page_ends_the_search_and_clears_position(agent, monkeypatch):
+    agent.state["last_leaderboard_position"] = 250
+    requested = _serve(agent, monkeypatch, {0: _page(0), 1: _page(1, size=40)})
+
+    assert agent.snapshot_leaderboard()
+    assert agent.state["last_leaderboard_position"] is None
+    assert requested == [0, 1]
+
+
+def test_empty_body_is_an_empty_page_not_a_failure(agent, monkeypatch):
+    monkeypatch.setattr(agent, "_call_moltx_api", lambda endpoint, **kwargs: [], raising=False)
+    assert agent._fetch_leaderboard_page(3) == []
+    monkeypatch.setattr(agent, "_call_moltx_api", lambda endpoint, **kwargs: None, raising=False)
+    assert agent._fetch_leaderboard_page(3) is None
+
+
+def test_ignored_offset_stops_the_search(agent, monkeypatch):
+    agent.state["last_leaderboard_position"] = 250
+    requested = _serve(agent, monkeypatch, {0: _page(0), 1: _page(0)})
+    assert agent.snapshot_leaderboard()
+    assert requested == [0, 1]
+    assert agent.state["last_leaderboard_position"] is None
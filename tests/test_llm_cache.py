@@ -0,0 +1,98 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import llm_cache
+from llm_cache import LLMResponseCache
+
+
+def test_get_put_survives_reopen(tmp_path):
+    db = tmp_path / "cache.db"
+    cache = LLMResponseCache(db)
+    key = LLMResponseCache.make_key("model", "system", "prompt", 0.8, 100)
+    assert cache.get(key) is None
+    cache.put(key, "answer")
+    assert cache.get(key) == "answer"
+    cache.close()
+
+    reopened = LLMResponseCache(db)
+    assert reopened.get(key) == "answer"
+    assert (reopened.hits, reopened.misses) == (1, 0)
+    reopened.close()
+
+
+def test_key_depends_on_every_part():
+    base = LLMResponseCache.make_key("model", "system", "prompt", 0.8, 100)
+    assert base == LLMResponseCache.make_key("model", "system", "prompt", 0.8, 100)
+    assert base != LLMResponseCache.make_key("model", "system", "prompt", 0.9, 100)
+    assert base != LLMResponseCache.make_key("model", ["system", "12:01"], "prompt", 0.8, 100)
+
+
+def test_expired_entries_miss_and_are_pruned(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.db", ttl_seconds=60)
+    cache.put("k", "old")
+    cache._memory["k"] = ("old", time.time() - 120)
+    cache._conn.execute("UPDATE llm_cache SET created_at = ?", (time.time() - 120,))
+
+    assert cache.get("k") is None
+    assert cache.prune() == 1
+    cache.close()
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.db", max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+    assert list(cache._memory) == ["b", "c"]
+    # Evicted from memory but still served from disk
+    assert cache.get("a") == "a"
+    cache.close()
+
+
+def test_module_does_not_import_the_agent():
+    # The chat UI imports the cache; it must not pull in the daemon's dotenv/logging setup
+    code = "import sys, llm_cache; sys.exit('molt_media_agent' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=str(Path(llm_cache.__file__).parent)).returncode == 0
+
+
+class _FakeMessages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(content=[SimpleNamespace(text=f"reply {self.calls}")], usage=None)
+
+
+def _llm_agent(agent, tmp_path):
+    agent.system_prompt = "system"
+    agent.llm_cache = LLMResponseCache(tmp_path / "cache.db")
+    agent.anthropic_client = SimpleNamespace(messages=_FakeMessages())
+    return agent
+
+
+def test_call_llm_does_not_cache_by_default(agent, tmp_path):
+    _llm_agent(agent, tmp_path)
+    first = agent._call_llm("write a reply", temperature=0.9)
+    second = agent._call_llm("write a reply", temperature=0.9)
+    assert (first, second) == ("reply 1", "reply 2")
+    agent.llm_cache.close()
+
+
+def test_call_llm_opt_in_cache(agent, tmp_path):
+    _llm_agent(agent, tmp_path)
+    first = agent._call_llm("analyse the feed", cache=True)
+    second = agent._call_llm("analyse the feed", cache=True)
+    assert first == second == "reply 1"
+    assert agent.anthropic_client.messages.calls == 1
+    agent.llm_cache.close()
+
+
+def test_call_llm_skips_caching_rejected_responses(agent, tmp_path):
+    _llm_agent(agent, tmp_path)
+    first = agent._call_llm("analyse the feed", cache=True, is_valid=lambda text: text.startswith("{"))
+    second = agent._call_llm("analyse the feed", cache=True, is_valid=lambda text: text.startswith("{"))
+    assert (first, second) == ("reply 1", "reply 2")
+    agent.llm_cache.close()
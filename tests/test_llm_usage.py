@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+USAGE = SimpleNamespace(input_tokens=100, output_tokens=20, cache_read_input_tokens=50, cache_creation_input_tokens=0)
+
+
+class _FakeMessages:
+    def create(self, **kwargs):
+        return SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=USAGE)
+
+
+def _today(agent):
+    return agent.state["llm_usage"][datetime.now(timezone.utc).date().isoformat()]
+
+
+def test_usage_is_recorded_under_the_explicit_site_and_current_job(agent):
+    agent.system_prompt = "system"
+    agent.anthropic_client = SimpleNamespace(messages=_FakeMessages())
+
+    agent._run_batched(lambda: agent._call_llm("prompt", site="wire_scan"), "wire_scan_job")
+    agent._call_groq("prompt", site="editorial_board")
+
+    day = _today(agent)
+    assert set(day["sites"]) == {"wire_scan", "editorial_board"}
+    assert day["jobs"]["wire_scan_job"]["calls"] == 1
+    assert day["jobs"]["other"]["calls"] == 1
+    # Cache reads count a tenth toward the budget
+    assert day["tokens"] == 2 * (100 + 20 + 5)
+
+
+def test_budget_scale_follows_daily_usage(agent, monkeypatch):
+    import molt_media_agent
+    monkeypatch.setattr(molt_media_agent, "DAILY_TOKEN_BUDGET", 1000)
+    agent._budget_scale_logged = 1.0
+    agent.state["llm_usage"] = {datetime.now(timezone.utc).date().isoformat(): {"tokens": 800, "jobs": {}, "sites": {}}}
+
+    assert agent._token_budget_scale() == 0.5
+    assert agent._budgeted(10) == 5
+
+
+class _FakeStream:
+    def __init__(self, chunks, error=None, snapshot_usage=None):
+        self.chunks, self.error = chunks, error
+        self.current_message_snapshot = SimpleNamespace(usage=snapshot_usage)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        yield from self.chunks
+        if self.error:
+            raise self.error
+
+
+def _stream_agent(agent, stream):
+    agent.system_prompt = "system"
+    agent.anthropic_client = SimpleNamespace(messages=SimpleNamespace(stream=lambda **kwargs: stream))
+    return agent
+
+
+def test_stream_cut_off_by_an_error_records_estimated_usage(agent):
+    _stream_agent(agent, _FakeStream(["a" * 40, "b" * 40], error=RuntimeError("connection reset")))
+
+    assert agent._stream_llm("prompt", site="editorial_board") == "a" * 40 + "b" * 40
+
+    site = _today(agent)["sites"]["editorial_board"]
+    assert site["calls"] == 1
+    assert site["input_tokens"] > 0
+    assert site["output_tokens"] == 20
+
+
+def test_stream_cut_off_by_the_deadline_prefers_snapshot_usage(agent):
+    stream = _FakeStream(["a" * 40] * 3, snapshot_usage=SimpleNamespace(input_tokens=300, output_tokens=1))
+    _stream_agent(agent, stream)
+
+    agent._stream_llm("prompt", max_seconds=-1, site="editorial_board")
+
+    site = _today(agent)["sites"]["editorial_board"]
+    assert site["input_tokens"] == 300
+    # The snapshot only counts output at the end, so the received text is estimated
+    assert site["output_tokens"] == 10
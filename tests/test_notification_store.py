@@ -0,0 +1,226 @@
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from molt_media_agent import NotificationStore
+
+
+def _notif(notif_id, actor="alice", kind="reply", created_at="2026-01-01T10:00:00Z"):
+    return notif_id, {"id": notif_id, "type": kind, "actor": {"name": actor}, "post": {"id": f"post-{notif_id}"},
+                      "created_at": created_at}
+
+
+def _age(store, notif_id, seconds):
+    store._conn.execute("UPDATE notifications SET updated_at = ? WHERE id = ?", (time.time() - seconds, notif_id))
+
+
+def test_add_dedups_and_known_covers_every_status(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    assert store.add([_notif("1"), _notif("2")]) == 2
+    assert store.add([_notif("1")]) == 0
+    assert store.add([_notif("3")], status="ignored") == 1
+    assert store.known(["1", "3", "4"]) == {"1", "3"}
+    assert store.backlog() == 2
+    store.close()
+
+
+def test_release_requeues_then_skips(tmp_path):
+    store = NotificationStore(tmp_path / "n.db", max_attempts=2)
+    store.add([_notif("1")])
+    [(notif_id, _)] = store.claim(1)
+    store.attempting(notif_id)
+    assert store.release(notif_id) == "queued"
+    store.claim(1)
+    store.attempting(notif_id)
+    assert store.release(notif_id) == "skipped"
+    assert store.backlog() == 0
+    store.close()
+
+
+def test_release_of_a_never_attempted_claim_does_not_count(tmp_path):
+    store = NotificationStore(tmp_path / "n.db", max_attempts=1)
+    store.add([_notif("1")])
+    for _ in range(3):
+        [(notif_id, _)] = store.claim(1)
+        assert store.release(notif_id) == "queued"
+    assert store._conn.execute("SELECT attempts FROM notifications").fetchone()[0] == 0
+    store.close()
+
+
+def test_stale_unattempted_claims_are_requeued_on_restart(tmp_path):
+    db = tmp_path / "n.db"
+    store = NotificationStore(db, claim_lease_seconds=60)
+    store.add([_notif("1"), _notif("2", actor="bob"), _notif("3", actor="carol")])
+    claimed = [notif_id for notif_id, _ in store.claim(3)]
+    assert sorted(claimed) == ["1", "2", "3"]
+    store.attempting("2")  # the process died while posting this reply
+    for notif_id in claimed:
+        _age(store, notif_id, 120)
+    store.close()
+
+    restarted = NotificationStore(db, claim_lease_seconds=60)
+    assert restarted.backlog() == 2
+    assert sorted(notif_id for notif_id, _ in restarted.claim(5)) == ["1", "3"]
+    restarted.close()
+
+
+def test_fresh_claims_survive_another_process_opening_the_store(tmp_path):
+    db = tmp_path / "n.db"
+    daemon = NotificationStore(db, claim_lease_seconds=60)
+    daemon.add([_notif("1")])
+    assert daemon.claim(1)
+
+    other = NotificationStore(db, claim_lease_seconds=60)
+    assert other.backlog() == 0
+    other.close()
+    daemon.close()
+
+
+def test_prune_keeps_queued(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    store.add([_notif("1"), _notif("2")])
+    store.add([_notif("3")], status="ignored")
+    assert store.prune(datetime.now(timezone.utc) + timedelta(seconds=1)) == 1
+    assert store.known(["1", "2", "3"]) == {"1", "2"}
+    store.close()
+
+
+def _serve_notifications(agent, monkeypatch, total, page_size, honour_offset=True):
+    import molt_media_agent
+    monkeypatch.setattr(molt_media_agent, "NOTIF_PAGE_SIZE", page_size)
+    items = [{"id": f"n{i}", "type": "reply", "actor": {"name": f"a{i}"}, "post": {"id": f"p{i}"},
+              "created_at": f"2026-01-01T10:{59 - i:02d}:00Z"} for i in range(total)]
+    requested = []
+
+    def fake_api(endpoint, **kwargs):
+        match = re.search(r"offset=(\d+)", endpoint)
+        offset = int(match.group(1)) if match and honour_offset else 0
+        requested.append(offset)
+        return {"data": items[offset:offset + page_size]}
+
+    monkeypatch.setattr(agent, "_call_moltx_api", fake_api, raising=False)
+    return requested
+
+
+def test_paging_collects_a_burst_and_advances_the_cursor(agent, monkeypatch):
+    requested = _serve_notifications(agent, monkeypatch, total=25, page_size=10)
+    fetched = agent._fetch_new_notifications()
+    assert len(fetched) == 25
+    assert requested == [0, 10, 20]
+    assert agent.state["notif_cursor"] == "2026-01-01T10:59:00Z"
+
+
+def test_ignored_offset_stops_paging_without_duplicates(agent, monkeypatch):
+    requested = _serve_notifications(agent, monkeypatch, total=25, page_size=10, honour_offset=False)
+    fetched = agent._fetch_new_notifications()
+    assert [n["id"] for n in fetched] == [f"n{i}" for i in range(10)]
+    assert requested == [0, 0]
+    assert agent.state.get("notif_resume_page") == 0
+
+
+def test_engagement_loop_marks_the_reply_being_posted_as_attempting(agent, monkeypatch):
+    agent.dry_run = False
+    _serve_notifications(agent, monkeypatch, total=2, page_size=10)
+    monkeypatch.setattr(agent, "_generate_replies_batch", lambda requests: ["yo"] * len(requests), raising=False)
+
+    def crash(notif, reply):
+        raise RuntimeError("killed mid-post")
+
+    monkeypatch.setattr(agent, "_reply_to_notification", crash, raising=False)
+    monkeypatch.setattr("molt_media_agent.NOTIF_MAX_PER_ACTOR", 5)
+    with pytest.raises(RuntimeError):
+        agent.execute_engagement_loop()
+
+    statuses = dict(agent.notifications._conn.execute("SELECT id, status FROM notifications").fetchall())
+    # The first reply may have gone out; the second was never attempted and goes straight back in line
+    assert sorted(statuses.values()) == ["attempting", "queued"]
+
+
+def _claimed(store, limit, **kwargs):
+    return [notif_id for notif_id, _ in store.claim(limit, **kwargs)]
+
+
+def _fresh(notif_id, actor, kind="reply"):
+    return _notif(notif_id, actor=actor, kind=kind, created_at=datetime.now(timezone.utc).isoformat())
+
+
+def test_claim_caps_each_actor_then_fills_spare_capacity(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    store.add([_fresh("a1", "alice"), _fresh("a2", "alice"), _fresh("b1", "bob")],
+              scores={"a1": 100, "a2": 90, "b1": 10})
+    assert _claimed(store, 2, max_per_actor=1) == ["a1", "b1"]
+    assert _claimed(store, 5, max_per_actor=1) == ["a2"]
+    store.close()
+
+
+def test_fairness_is_not_limited_to_the_top_candidates(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    # One chatty actor fills far more than limit * 5 of the top slots
+    store.add([_fresh(f"a{i}", "alice") for i in range(30)], scores={f"a{i}": 100 - i for i in range(30)})
+    store.add([_fresh("b1", "bob")], scores={"b1": 1})
+    assert _claimed(store, 2, max_per_actor=1) == ["a0", "b1"]
+    store.close()
+
+
+def test_notifications_without_actor_do_not_share_a_bucket(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    anonymous = [(notif_id, {**n, "actor": None}) for notif_id, n in (_fresh("x1", None), _fresh("x2", None))]
+    store.add(anonymous + [_fresh("a1", "alice")], scores={"x1": 50, "x2": 40, "a1": 30})
+    assert _claimed(store, 3, max_per_actor=1) == ["x1", "x2", "a1"]
+    store.close()
+
+
+def test_recent_replies_penalise_the_same_actor(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    store.add([_fresh("old", "alice")], scores={"old": 100})
+    store.claim(1)
+    store.finish("old")
+    store.add([_fresh("a1", "alice"), _fresh("b1", "bob")], scores={"a1": 100, "b1": 90})
+    assert _claimed(store, 1, recent_reply_penalty=20) == ["b1"]
+    store.close()
+
+
+def test_actor_bonus_is_applied_at_claim_time(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    store.add([_fresh("a1", "Alice"), _fresh("b1", "bob")], scores={"a1": 40, "b1": 50})
+    assert _claimed(store, 1, actor_bonus={"alice": 20}) == ["a1"]
+    store.close()
+
+
+def test_age_penalty_decays_priority(tmp_path):
+    store = NotificationStore(tmp_path / "n.db")
+    old = (datetime.now(timezone.utc) - timedelta(hours=10)).isoformat()
+    store.add([_notif("old", actor="alice", created_at=old), _fresh("new", "bob")], scores={"old": 100, "new": 80})
+    assert _claimed(store, 1, age_penalty_per_hour=5) == ["new"]
+    store.close()
+
+
+def test_engagement_loop_uses_current_leaderboard_ranks(agent, monkeypatch):
+    agent.dry_run = False
+    _serve_notifications(agent, monkeypatch, total=2, page_size=10)
+    monkeypatch.setattr(agent, "_reply_to_notification", lambda notif, reply: True, raising=False)
+    claimed = []
+    original_claim = agent.notifications.claim
+    monkeypatch.setattr(agent.notifications, "claim",
+                        lambda limit, **kwargs: claimed.append(kwargs["actor_bonus"]) or original_claim(limit, **kwargs))
+    monkeypatch.setattr(agent, "_generate_replies_batch", lambda requests: ["yo"] * len(requests), raising=False)
+
+    agent.leaderboard.record([("A1", 1, 100)])
+    agent.execute_engagement_loop()
+
+    assert claimed[0] == {"a1": 50.0}
+    # The stored score is the type score alone, so a later rank change takes effect at the next claim
+    scores = dict(agent.notifications._conn.execute("SELECT id, score FROM notifications").fetchall())
+    assert scores == {"n0": 100.0, "n1": 100.0}
+
+
+def test_dry_run_engagement_loop_leaves_the_shared_queue_alone(agent, monkeypatch):
+    requested = _serve_notifications(agent, monkeypatch, total=2, page_size=10)
+    agent.notifications.add([_notif("live")])
+    agent.execute_engagement_loop()
+
+    statuses = dict(agent.notifications._conn.execute("SELECT id, status FROM notifications").fetchall())
+    assert statuses == {"live": "queued"}
+    assert len(requested) == 1  # the fetch only - nothing was marked read
@@ -0,0 +1,156 @@
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from molt_media_agent import OutboundQueue
+
+
+def _dead_pid():
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    return child.pid
+
+
+def _set_owner(queue, job_id, pid, age=0.0):
+    queue._conn.execute(
+        "UPDATE outbound_jobs SET owner_pid = ?, updated_at = ? WHERE id = ?", (pid, time.time() - age, job_id)
+    )
+
+
+def test_claim_complete_and_group_tracking(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db")
+    moltx = queue.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    moltbook = queue.enqueue("moltbook", "test", {"content": "hi"}, "g1")
+
+    job = queue.claim(moltx)
+    assert job["payload"] == {"content": "hi"} and job["status"] == "in_flight"
+    assert queue.claim(moltx) is None  # already in flight
+
+    queue.complete(moltx)
+    assert queue.group_sent("g1", exclude_id=moltbook)
+    assert not queue.group_sent("g1", exclude_id=moltx)
+    assert queue.counts() == {"done": 1, "pending": 1}
+    queue.close()
+
+
+def test_second_process_does_not_steal_live_in_flight_jobs(tmp_path):
+    db = tmp_path / "q.db"
+    daemon = OutboundQueue(db)
+    job_id = daemon.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    assert daemon.claim(job_id)
+
+    # A catch-up script or --export-activity opening the same queue must leave it alone
+    other = OutboundQueue(db)
+    assert other.claim_due() == []
+    assert other.counts() == {"in_flight": 1}
+    other.close()
+    daemon.close()
+
+
+def test_jobs_of_a_dead_process_are_recovered(tmp_path):
+    db = tmp_path / "q.db"
+    queue = OutboundQueue(db)
+    job_id = queue.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    queue.claim(job_id)
+    _set_owner(queue, job_id, _dead_pid())
+    queue.close()
+
+    restarted = OutboundQueue(db)
+    assert restarted.counts() == {"pending": 1}
+    assert [job["id"] for job in restarted.claim_due()] == [job_id]
+    restarted.close()
+
+
+def test_expired_lease_is_recovered_even_if_owner_pid_is_alive(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db", lease_seconds=60)
+    job_id = queue.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    queue.claim(job_id)
+
+    assert queue.recover_stale() == 0
+    # The PID may have been reused by an unrelated process (PID 1 is always alive)
+    _set_owner(queue, job_id, 1, age=120)
+    assert queue.recover_stale() == 1
+    assert queue.counts() == {"pending": 1}
+    queue.close()
+
+
+def test_legacy_rows_without_owner_wait_for_the_lease(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db", lease_seconds=60)
+    job_id = queue.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    queue.claim(job_id)
+    _set_owner(queue, job_id, None)
+    assert queue.recover_stale() == 0
+    _set_owner(queue, job_id, None, age=120)
+    assert queue.recover_stale() == 1
+    queue.close()
+
+
+def test_claim_due_across_processes_claims_each_job_once(tmp_path):
+    db = tmp_path / "q.db"
+    setup = OutboundQueue(db)
+    for n in range(20):
+        setup.enqueue("moltx", "test", {"n": n}, f"g{n}")
+    setup.close()
+
+    script = (
+        "import sys, json; sys.path.insert(0, sys.argv[2]);"
+        "from molt_media_agent import OutboundQueue;"
+        "q = OutboundQueue(__import__('pathlib').Path(sys.argv[1]));"
+        "print(json.dumps([j['id'] for j in q.claim_due(limit=20)]))"
+    )
+    root = str(Path(__file__).resolve().parent.parent)
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(db), root], stdout=subprocess.PIPE, text=True)
+               for _ in range(3)]
+    claimed = []
+    for worker in workers:
+        out, _ = worker.communicate(timeout=60)
+        claimed += json.loads(out.strip().splitlines()[-1])
+
+    assert sorted(claimed) == list(range(1, 21))
+
+
+def test_retry_backs_off_then_fails(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db", max_attempts=2, retry_base_seconds=10)
+    job_id = queue.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    queue.claim(job_id)
+    delay = queue.retry(job_id, "HTTP 500")
+    assert 7.5 <= delay <= 12.5
+    assert queue.claim_due() == []  # not eligible yet
+
+    queue._conn.execute("UPDATE outbound_jobs SET next_eligible = 0 WHERE id = ?", (job_id,))
+    assert queue.claim_due()
+    assert queue.retry(job_id, "HTTP 500") is None
+    assert queue.counts() == {"failed": 1}
+    queue.close()
+
+
+def test_expired_jobs_are_dropped_instead_of_sent(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db")
+    stale = queue.enqueue("moltx", "test", {"content": "old"}, "g1", ttl=60)
+    fresh = queue.enqueue("moltx", "test", {"content": "new"}, "g2", ttl=3600)
+    queue._conn.execute("UPDATE outbound_jobs SET expires_at = ? WHERE id = ?", (time.time() - 1, stale))
+
+    assert queue.claim(stale) is None
+    assert [job["id"] for job in queue.claim_due()] == [fresh]
+    assert queue.counts() == {"expired": 1, "in_flight": 1}
+    queue.close()
+
+
+def test_superseding_enqueue_replaces_pending_jobs_of_the_same_source(tmp_path):
+    queue = OutboundQueue(tmp_path / "q.db")
+    first = queue.enqueue("moltx", "engagement_starter", {"content": "one?"}, "g1", supersede=True)
+    other = queue.enqueue("moltbook", "engagement_starter", {"content": "one?"}, "g1", supersede=True)
+    second = queue.enqueue("moltx", "engagement_starter", {"content": "two?"}, "g2", supersede=True)
+
+    statuses = dict(queue._conn.execute("SELECT id, status FROM outbound_jobs").fetchall())
+    assert statuses == {first: "superseded", other: "pending", second: "pending"}
+    queue.close()
+
+
+def test_dry_run_does_not_drain_the_shared_queue(agent):
+    job_id = agent.outbound.enqueue("moltx", "test", {"content": "hi"}, "g1")
+    agent._drain_outbound_queue()
+    assert agent.outbound.counts() == {"pending": 1}
+    assert agent.outbound.claim(job_id) is not None
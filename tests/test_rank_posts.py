@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+
+
+def test_rank_posts_orders_by_local_signals_and_drops_own_posts(agent, monkeypatch):
+    monkeypatch.setattr(agent, "_leaderboard_ranks", lambda: {"toprank": 1}, raising=False)
+    fresh = (datetime.now(timezone.utc) - timedelta(minutes=5)).isoformat()
+    stale = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    posts = [
+        {"id": "plain", "author": "nobody", "content": "hello", "created_at": stale},
+        {"id": "question", "author": "toprank", "content": "which agent launch wins?", "created_at": fresh},
+        {"id": "own", "author": "MoltMedia", "content": "our own question?", "created_at": fresh},
+    ]
+
+    ranked = agent._rank_posts(posts)
+
+    assert [p["id"] for _, p in ranked] == ["question", "plain"]
+
+
+def test_wire_scan_stores_rank_scores(agent, monkeypatch):
+    posts = [
+        {"id": "p1", "author": "alice", "content": "what ships next?", "created_at": "2026-01-01T10:00:00Z"},
+        {"id": "p2", "author": "bob", "content": "launch day", "created_at": "2026-01-01T11:00:00Z"},
+    ]
+    monkeypatch.setattr(agent, "_call_moltx_api", lambda endpoint, **kwargs: {"data": posts}, raising=False)
+    monkeypatch.setattr(agent, "check_leaderboard_position", lambda: None, raising=False)
+    monkeypatch.setattr(agent, "_leaderboard_ranks", lambda: {}, raising=False)
+    monkeypatch.setattr(agent, "_call_llm", lambda *args, **kwargs: '{"engagement_targets": [], "skip_posting": true}', raising=False)
+    monkeypatch.setattr(agent, "_fan_out_replies", lambda targets, replies: 0, raising=False)
+
+    agent.execute_wire_scan()
+
+    rows = dict(agent.seen_posts._conn.execute("SELECT post_id, score FROM seen_posts").fetchall())
+    assert set(rows) == {"p1", "p2"}
+    assert all(score is not None for score in rows.values())
+    assert rows["p1"] > rows["p2"]
@@ -0,0 +1,104 @@
+import time
+
+import requests
+
+import molt_media_agent
+from molt_media_agent import RateLimiter, TokenBucket
+
+LIMITS = {("moltx", "post"): (5, 12 * 3600), ("moltx", "other"): (300, 60)}
+
+
+def _response(status=200, **headers):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update({f"X-RateLimit-{name}": str(value) for name, value in headers.items()})
+    return response
+
+
+def _drain(limiter, platform, action, count):
+    for _ in range(count):
+        assert limiter.try_acquire(platform, action)
+
+
+def test_bucket_refills_over_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(molt_media_agent.time, "monotonic", lambda: clock[0])
+    bucket = TokenBucket(capacity=2, refill_per_second=1)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock[0] += 1.5
+    assert bucket.try_acquire()
+    assert round(bucket.level(), 2) == 0.5
+    clock[0] += 60
+    assert bucket.level() == 2
+
+
+def test_bucket_lower_level_never_raises():
+    bucket = TokenBucket(capacity=10, refill_per_second=0)
+    bucket.set_level(3)
+    bucket.lower_level(8)
+    assert bucket.level() == 3
+    bucket.lower_level(1)
+    assert bucket.level() == 1
+
+
+def test_general_limit_headers_do_not_refill_the_post_bucket():
+    limiter = RateLimiter(LIMITS)
+    _drain(limiter, "moltx", "post", 5)
+
+    # The 300/min general limit answered - its remaining count says nothing about posts
+    limiter.observe("moltx", "post", _response(Limit=300, Remaining=299, Reset=int(time.time()) + 60))
+    assert not limiter.try_acquire("moltx", "post")
+
+
+def test_matching_headers_only_lower_the_level():
+    limiter = RateLimiter(LIMITS)
+    _drain(limiter, "moltx", "post", 3)
+
+    limiter.observe("moltx", "post", _response(Limit=5, Remaining=5))
+    assert int(limiter.available("moltx", "post")) == 2
+
+    limiter.observe("moltx", "post", _response(Limit=5, Remaining=1))
+    assert int(limiter.available("moltx", "post")) == 1
+
+
+def test_headers_without_limit_only_lower_the_level():
+    limiter = RateLimiter(LIMITS)
+    _drain(limiter, "moltx", "post", 4)
+    limiter.observe("moltx", "post", _response(Remaining=250))
+    assert int(limiter.available("moltx", "post")) == 1
+
+
+def test_exhausted_limit_blocks_until_reset():
+    limiter = RateLimiter(LIMITS)
+    reset = time.time() + 120
+    limiter.observe("moltx", "post", _response(Limit=5, Remaining=0, Reset=reset))
+    assert limiter.available("moltx", "post") == 0
+    assert 100 < limiter.blocked_for("moltx", "post") <= 120
+    assert not limiter.try_acquire("moltx", "post")
+
+
+def test_429_empties_the_bucket_and_honours_retry_after():
+    limiter = RateLimiter(LIMITS)
+    response = _response(429)
+    response.headers["Retry-After"] = "30"
+    limiter.observe("moltx", "post", response)
+    assert limiter.available("moltx", "post") == 0
+    assert 20 < limiter.blocked_for("moltx", "post") <= 30
+
+
+def test_unknown_actions_fall_back_to_other():
+    limiter = RateLimiter(LIMITS)
+    assert limiter.available("moltx", "follow") == 300
+    assert limiter.available("moltbook", "post") == float("inf")
+
+
+def test_snapshot_round_trip_refills_for_elapsed_time():
+    limiter = RateLimiter(LIMITS)
+    _drain(limiter, "moltx", "post", 5)
+    snapshot = limiter.snapshot()
+    snapshot["moltx.post"]["at"] -= 12 * 3600 / 5  # one token's worth of refill
+
+    restored = RateLimiter(LIMITS)
+    restored.restore(snapshot)
+    assert 0.99 < restored.available("moltx", "post") < 1.1
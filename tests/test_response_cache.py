@@ -0,0 +1,51 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from molt_media_agent import ResponseCache
+
+
+def test_entries_survive_reopen_with_validators(tmp_path):
+    db = tmp_path / "c.db"
+    cache = ResponseCache(db)
+    cache.put("moltx:/v1/leaderboard", {"data": [1]}, etag='"abc"')
+    cache.close()
+
+    reopened = ResponseCache(db)
+    entry = reopened.get("moltx:/v1/leaderboard")
+    assert entry["body"] == {"data": [1]} and entry["etag"] == '"abc"'
+    reopened.close()
+
+
+def test_memory_tier_is_lru_bounded(tmp_path):
+    cache = ResponseCache(tmp_path / "c.db", max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert list(cache._memory) == ["a", "c"]
+    # Evicted from memory, still on disk
+    assert cache.get("b")["body"] == 2
+    cache.close()
+
+
+def test_prune_drops_entries_not_refreshed_since(tmp_path):
+    cache = ResponseCache(tmp_path / "c.db")
+    cache.put("old", 1)
+    cache.put("fresh", 2)
+    stale = time.time() - 2 * 86400
+    cache._memory["old"]["fetched_at"] = stale
+    cache._conn.execute("UPDATE http_cache SET fetched_at = ? WHERE key = 'old'", (stale,))
+
+    assert cache.prune(datetime.now(timezone.utc) - timedelta(days=1)) == 1
+    assert cache.get("old") is None
+    assert cache.get("fresh")["body"] == 2
+    cache.close()
+
+
+def test_cursor_feed_reads_bypass_the_cache(agent, monkeypatch):
+    calls = []
+    monkeypatch.setattr(agent, "_call_moltx_api",
+                        lambda endpoint, **kwargs: calls.append((endpoint, kwargs.get("cache_ttl"))), raising=False)
+    agent.state["feed_cursor"] = "2026-01-01T10:00:00Z"
+    agent.execute_wire_scan()
+    assert calls == [("/v1/feed/global?since=2026-01-01T10%3A00%3A00Z", None)]
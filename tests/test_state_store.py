@@ -0,0 +1,68 @@
+import json
+import sqlite3
+import threading
+
+from molt_media_agent import StateStore
+
+
+def test_defaults_persist_and_reload(tmp_path):
+    db = tmp_path / "state.db"
+    store = StateStore(db, {"posts_today": 0, "seen": []})
+    store["posts_today"] = 3
+    store.close()
+
+    reopened = StateStore(db, {"posts_today": 0, "other": 1})
+    assert reopened["posts_today"] == 3
+    assert "other" not in reopened  # defaults only seed an empty store
+    reopened.close()
+
+
+def test_legacy_json_migrated_once(tmp_path):
+    legacy = tmp_path / "state.json"
+    legacy.write_text(json.dumps({"posts_today": 7}))
+    store = StateStore(tmp_path / "state.db", {"posts_today": 0}, legacy_json=legacy)
+    assert store["posts_today"] == 7
+    store.close()
+
+
+def test_batch_defers_flush_until_outermost_exit(tmp_path):
+    db = tmp_path / "state.db"
+    store = StateStore(db, {})
+    with store.batch():
+        store["a"] = 1
+        with store.batch():
+            store["b"] = 2
+            store.save()
+        # Inner batch exit must not flush
+        assert _persisted(db) == {}
+    assert _persisted(db) == {"a": 1, "b": 2}
+    store.close()
+
+
+def test_delete_is_persisted(tmp_path):
+    db = tmp_path / "state.db"
+    store = StateStore(db, {"a": 1, "b": 2})
+    del store["a"]
+    store.flush()
+    assert _persisted(db) == {"b": 2}
+    store.close()
+
+
+def test_batch_is_per_thread(tmp_path):
+    db = tmp_path / "state.db"
+    store = StateStore(db, {})
+    with store.batch():
+        worker = threading.Thread(target=lambda: (store.__setitem__("x", 1), store.save()))
+        worker.start()
+        worker.join()
+        # The other thread was not inside a batch, so its save flushed immediately
+        assert _persisted(db) == {"x": 1}
+    store.close()
+
+
+def _persisted(db):
+    conn = sqlite3.connect(str(db))
+    try:
+        return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM state")}
+    finally:
+        conn.close()
@@ -0,0 +1,62 @@
+POSTS = [
+    {"id": "p1", "author": "alice", "content": "what ships next?", "created_at": "2026-01-01T10:00:00Z"},
+    {"id": "p2", "author": "bob", "content": "launch day", "created_at": "2026-01-01T11:00:00Z"},
+]
+
+
+def _stub_scan(agent, monkeypatch, analysis):
+    monkeypatch.setattr(agent, "_call_moltx_api", lambda endpoint, **kwargs: {"data": POSTS}, raising=False)
+    monkeypatch.setattr(agent, "check_leaderboard_position", lambda: None, raising=False)
+    monkeypatch.setattr(agent, "_leaderboard_ranks", lambda: {}, raising=False)
+    monkeypatch.setattr(agent, "_call_llm", lambda *args, **kwargs: analysis, raising=False)
+
+
+def test_failed_analysis_leaves_posts_unseen(agent, monkeypatch):
+    _stub_scan(agent, monkeypatch, None)
+    agent.execute_wire_scan()
+
+    assert agent.seen_posts.unseen(["p1", "p2"]) == {"p1", "p2"}
+    assert agent.state.get("feed_cursor") is None
+
+
+def test_unparseable_analysis_leaves_posts_unseen(agent, monkeypatch):
+    _stub_scan(agent, monkeypatch, "no json here")
+    agent.execute_wire_scan()
+
+    assert agent.seen_posts.unseen(["p1", "p2"]) == {"p1", "p2"}
+    assert agent.state.get("feed_cursor") is None
+
+
+def test_successful_analysis_marks_posts_seen_and_advances_cursor(agent, monkeypatch):
+    _stub_scan(agent, monkeypatch, '{"engagement_targets": [], "skip_posting": true}')
+    monkeypatch.setattr(agent, "_fan_out_replies", lambda targets, replies: 0, raising=False)
+    agent.execute_wire_scan()
+
+    assert agent.seen_posts.unseen(["p1", "p2"]) == set()
+    assert agent.state["feed_cursor"] == "2026-01-01T11:00:00Z"
+
+
+def test_posts_cut_from_the_prompt_stay_unseen(agent, monkeypatch):
+    _stub_scan(agent, monkeypatch, '{"engagement_targets": [], "skip_posting": true}')
+    monkeypatch.setattr(agent, "_fan_out_replies", lambda targets, replies: 0, raising=False)
+    # p1 (a question) outranks p2 and is the only post that fits the budget
+    monkeypatch.setattr(agent, "_compact_feed", lambda posts, budget: ("[p1] ...", 1, len(posts) - 1), raising=False)
+    agent.execute_wire_scan()
+
+    assert agent.seen_posts.unseen(["p1", "p2"]) == {"p2"}
+    # The cursor stays below the held-back post so the next `since` fetch returns it
+    assert agent.state.get("feed_cursor") == "2026-01-01T10:00:00Z"
+
+
+def test_targets_without_post_id_are_skipped(agent):
+    agent.seen_posts.mark_seen([("p1", "alice", None)])
+    agent.seen_posts.mark_replied("p1")
+    targets = [
+        {"agent": "alice", "post_id": "p1"},
+        {"agent": "carol"},
+        {"agent": "dave", "post_id": None},
+        {"agent": "bob", "post_id": "p2"},
+        {"agent": "bob", "post_id": "p2"},
+    ]
+
+    assert agent._drop_replied_targets(targets) == [{"agent": "bob", "post_id": "p2"}]